@@ -0,0 +1,164 @@
+# batch.py
+"""Headless bulk weather lookups with JSONL output.
+
+Reads one query per line from a file or stdin, either a city name
+(``London`` / ``London,GB``) or a ``lat,lon`` pair, fetches current
+weather through WeatherService with bounded concurrency, and writes one
+JSON object per line as each result arrives (completion order; every
+record carries its input line number)::
+
+    python -m mod6_labs.batch cities.txt -o results.jsonl --concurrency 16
+    cat cities.txt | python -m mod6_labs.batch > results.jsonl
+
+Input is read lazily through a bounded queue and results are written
+immediately, so memory use does not grow with the input size.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Dict, IO, Optional, Tuple, Union
+
+from mod6_labs.config import Config
+from mod6_labs.rate_limiter import Priority
+from mod6_labs.weather_service import WeatherService
+
+Query = Union[str, Tuple[float, float]]
+
+
+def parse_query(line: str) -> Optional[Query]:
+    """
+    Parse one input line.
+
+    Args:
+        line: City name or "lat,lon"
+
+    Returns:
+        City name, (lat, lon) tuple, or None for blank and comment lines
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+
+    parts = line.split(",")
+    if len(parts) == 2:
+        try:
+            return float(parts[0]), float(parts[1])
+        except ValueError:
+            pass
+    return line
+
+
+async def fetch(service: WeatherService, query: Query) -> Dict:
+    """Fetch one query and return its JSON-serializable result."""
+    if isinstance(query, tuple):
+        snapshot = await service.get_weather_by_coordinates(
+            *query, priority=Priority.BACKGROUND
+        )
+    else:
+        snapshot = await service.get_weather(query, priority=Priority.BACKGROUND)
+    return snapshot.to_dict()
+
+
+async def run(
+    source: IO[str],
+    sink: IO[str],
+    concurrency: int = 8,
+    service: Optional[WeatherService] = None,
+) -> Dict[str, int]:
+    """
+    Stream queries from ``source`` to JSONL results in ``sink``.
+
+    Args:
+        source: Text stream with one query per line
+        sink: Text stream receiving one JSON object per line
+        concurrency: Maximum requests in flight
+        service: WeatherService to use (a new one is created if omitted)
+
+    Returns:
+        Counts of successful and failed lookups
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    counts = {"ok": 0, "failed": 0}
+    owns_service = service is None
+    if service is None:
+        service = WeatherService()
+
+    async def read() -> None:
+        line_number = 0
+        while True:
+            line = await asyncio.to_thread(source.readline)
+            if not line:
+                break
+            line_number += 1
+            query = parse_query(line)
+            if query is not None:
+                await queue.put((line_number, line.strip(), query))
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def work() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            line_number, text, query = item
+            record = {"line": line_number, "query": text}
+            try:
+                record["weather"] = await fetch(service, query)
+                counts["ok"] += 1
+            except Exception as e:
+                record["error"] = str(e)
+                counts["failed"] += 1
+            sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+            sink.flush()
+
+    try:
+        await asyncio.gather(read(), *(work() for _ in range(concurrency)))
+    finally:
+        if owns_service:
+            await service.aclose()
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fetch current weather for many cities as JSONL.")
+    parser.add_argument("input", nargs="?", default="-", help="file with one city or lat,lon per line (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=Config.WATCHLIST_CONCURRENCY,
+        help="requests in flight",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        Config.validate()
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        counts = asyncio.run(run(source, sink, concurrency=max(1, args.concurrency)))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"{counts['ok']} ok, {counts['failed']} failed in {elapsed:.2f} s",
+        file=sys.stderr,
+    )
+    return 0 if not counts["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
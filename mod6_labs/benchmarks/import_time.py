@@ -0,0 +1,127 @@
+# import_time.py
+"""Import-time benchmark for the weather app startup path.
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters
+and reports the cumulative import time, the time the app adds on top of
+the UI framework it cannot avoid (``--baseline``, flet by default), the
+slowest modules, and whether the app itself eagerly imported any module
+that should wait until after the first frame (network stack, numpy,
+dotenv, sqlite). Flet already imports httpx, so those are only flagged
+when the baseline does not pull them in.
+
+Usage (from the repository root)::
+
+    python -m mod6_labs.benchmarks.import_time
+    python -m mod6_labs.benchmarks.import_time --runs 10 --json import_time.jsonl
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# Modules the app should not import before its first frame
+DEFERRED_MODULES = ("httpx", "httpcore", "numpy", "dotenv", "sqlite3")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse ``-X importtime`` output.
+
+    Args:
+        stderr: Interpreter stderr
+
+    Returns:
+        List of (module, self_us, cumulative_us) in import order
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(module: str) -> Dict:
+    """
+    Import ``module`` once in a fresh interpreter.
+
+    Returns:
+        Dict with the module's cumulative time, all rows, and the
+        top-level names of deferred modules that were imported
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    rows = parse_importtime(result.stderr)
+    total = next((cum for name, _, cum in rows if name == module), 0)
+    eager = sorted(
+        {
+            name.split(".")[0]
+            for name, _, _ in rows
+            if name.split(".")[0] in DEFERRED_MODULES
+        }
+    )
+    return {"total_us": total, "rows": rows, "eager": eager}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="mod6_labs.main", help="module to import")
+    parser.add_argument("--baseline", default="flet", help="framework import to subtract")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    parser.add_argument("--json", help="append a JSON result line to this file")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    totals = [run["total_us"] for run in runs]
+    median_ms = statistics.median(totals) / 1000
+
+    baseline_runs = [measure(args.baseline) for _ in range(args.runs)]
+    baseline_ms = statistics.median(run["total_us"] for run in baseline_runs) / 1000
+    app_ms = median_ms - baseline_ms
+
+    print(f"import {args.module}: median {median_ms:.1f} ms over {args.runs} runs "
+          f"(min {min(totals) / 1000:.1f} ms, max {max(totals) / 1000:.1f} ms)")
+    print(f"import {args.baseline}: median {baseline_ms:.1f} ms "
+          f"-> app adds {app_ms:.1f} ms")
+
+    print("\nSlowest modules by self time (last run):")
+    for name, self_us, cumulative_us in sorted(
+        runs[-1]["rows"], key=lambda row: row[1], reverse=True
+    )[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  (cumulative {cumulative_us / 1000:8.1f} ms)  {name}")
+
+    eager = [name for name in runs[-1]["eager"] if name not in baseline_runs[-1]["eager"]]
+    if eager:
+        print(f"\nImported before first use: {', '.join(eager)}")
+    else:
+        print("\nNo deferred modules imported at startup.")
+
+    if args.json:
+        with open(args.json, "a") as f:
+            f.write(json.dumps({
+                "timestamp": time.time(),
+                "module": args.module,
+                "runs": args.runs,
+                "median_ms": round(median_ms, 2),
+                "baseline_ms": round(baseline_ms, 2),
+                "app_ms": round(app_ms, 2),
+                "eager_modules": eager,
+            }) + "\n")
+
+    return 1 if eager else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# mock_server.py
+"""Local stand-in for the OpenWeather endpoints used by WeatherService.
+
+Serves ``/weather`` (by ``q`` or ``lat``/``lon``), ``/forecast`` and
+``/group`` with deterministic, well-formed payloads, plus configurable
+latency, error rate and payload padding, so the service layer can be
+measured without the real API or an API key::
+
+    python -m mod6_labs.benchmarks.mock_server --port 8765 --latency 0.05
+
+then point the app at it::
+
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8765/data/2.5/weather
+    OPENWEATHER_FORECAST_URL=http://127.0.0.1:8765/data/2.5/forecast
+    OPENWEATHER_GROUP_URL=http://127.0.0.1:8765/data/2.5/group
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+FORECAST_SLOTS = 40  # 5 days x 8 three-hour slots, like the real API
+CONDITIONS = [
+    (800, "clear sky", "01d"),
+    (802, "scattered clouds", "03d"),
+    (500, "light rain", "10d"),
+    (600, "light snow", "13d"),
+]
+
+
+def city_id(name: str) -> int:
+    """Stable fake city ID for a name."""
+    return zlib.crc32(name.casefold().encode("utf-8")) % 10_000_000
+
+
+def current_payload(name: str, identifier: Optional[int] = None) -> Dict:
+    """Build a /weather response body."""
+    identifier = city_id(name) if identifier is None else identifier
+    condition_id, description, icon = CONDITIONS[identifier % len(CONDITIONS)]
+    temp = (identifier % 400) / 10 - 5
+    return {
+        "id": identifier,
+        "name": name.split(",")[0],
+        "sys": {"country": name.split(",")[1] if "," in name else "XX"},
+        "main": {"temp": temp, "feels_like": temp - 1.5, "humidity": identifier % 100},
+        "weather": [{"id": condition_id, "description": description, "icon": icon}],
+        "wind": {"speed": (identifier % 150) / 10},
+        "dt": int(time.time()),
+    }
+
+
+def forecast_payload(name: str) -> Dict:
+    """Build a /forecast response body."""
+    identifier = city_id(name)
+    start = int(time.time()) // 10800 * 10800
+    slots = []
+    for slot in range(FORECAST_SLOTS):
+        condition_id, description, icon = CONDITIONS[(identifier + slot // 3) % len(CONDITIONS)]
+        temp = (identifier % 300) / 10 + (slot % 8) - 4
+        slots.append({
+            "dt": start + slot * 10800,
+            "main": {"temp": temp, "feels_like": temp - 1.5, "humidity": (identifier + slot) % 100},
+            "weather": [{"id": condition_id, "description": description, "icon": icon}],
+            "wind": {"speed": ((identifier + slot) % 150) / 10},
+        })
+    return {
+        "list": slots,
+        "city": {"id": identifier, "name": name.split(",")[0], "country": "XX", "timezone": 0},
+    }
+
+
+class MockSettings:
+    """Behaviour shared by all request handlers of one server."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        payload_size: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.payload_size = payload_size
+
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        # id -> name for cities served by /weather, so /group can answer
+        self.names: Dict[int, str] = {}
+
+    def count(self, error: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += error
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Answers /weather, /forecast and /group requests."""
+
+    settings: MockSettings = MockSettings()
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        settings = self.settings
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        delay = settings.latency + random.uniform(0, settings.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if random.random() < settings.error_rate:
+            settings.count(error=True)
+            return self._send(settings.error_status, {"message": "mock upstream error"})
+
+        endpoint = url.path.rsplit("/", 1)[-1]
+        if endpoint == "weather" and "q" in params:
+            body = current_payload(params["q"])
+            settings.names[body["id"]] = params["q"]
+        elif endpoint == "weather" and "lat" in params:
+            body = current_payload(f"{params['lat']},{params['lon']}")
+        elif endpoint == "forecast" and "q" in params:
+            body = forecast_payload(params["q"])
+        elif endpoint == "group" and "id" in params:
+            ids = [int(value) for value in params["id"].split(",") if value]
+            body = {
+                "cnt": len(ids),
+                "list": [
+                    current_payload(settings.names.get(identifier, str(identifier)), identifier)
+                    for identifier in ids
+                ],
+            }
+        else:
+            settings.count(error=True)
+            return self._send(404, {"cod": "404", "message": "city not found"})
+
+        if settings.payload_size:
+            body["padding"] = "x" * settings.payload_size
+        settings.count(error=False)
+        self._send(200, body)
+
+    def _send(self, status: int, body: Dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up (deadline or losing hedge); nothing to answer
+            self.close_connection = True
+
+
+class MockHTTPServer(ThreadingHTTPServer):
+    """Threaded server with a listen backlog sized for concurrent benchmarks."""
+
+    request_queue_size = 128
+
+
+class MockServer:
+    """Run the mock API on a background thread.
+
+    Usable as a context manager; ``base`` is the URL prefix to use in
+    place of ``https://api.openweathermap.org/data/2.5``.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **settings):
+        self.settings = MockSettings(**settings)
+        handler = type("Handler", (MockHandler,), {"settings": self.settings})
+        self.httpd = MockHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/data/2.5"
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mock OpenWeather API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of failed requests")
+    parser.add_argument("--payload-size", type=int, default=0, help="padding bytes added to every payload")
+    args = parser.parse_args(argv)
+
+    server = MockServer(
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        payload_size=args.payload_size,
+    )
+    print(f"Serving mock OpenWeather API at {server.base}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+# service_bench.py
+"""Throughput and latency benchmark for WeatherService against the mock API.
+
+Starts ``mock_server`` on a free local port, points WeatherService at it
+and runs three workloads:
+
+- ``single``: individual ``get_weather`` calls for distinct cities
+- ``watchlist``: repeated ``get_weather_many`` refreshes of one watchlist
+  (memory cache cleared between rounds, so IDs are learned once and the
+  rest goes through ``/group``)
+- ``batch``: the ``mod6_labs.batch`` JSONL pipeline over generated input
+
+Each reports operations per second and p50/p95/p99 latency in
+milliseconds. The client-side rate limit is lifted so the numbers
+reflect the service layer rather than the throttle. The mock server runs
+in the same process, so absolute numbers include its cost; compare runs
+with the same settings against each other.
+
+Usage (from the repository root)::
+
+    python -m mod6_labs.benchmarks.service_bench
+    python -m mod6_labs.benchmarks.service_bench --latency 0.05 --error-rate 0.02 --json bench.jsonl
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import sys
+import time
+from typing import Dict, List
+
+from mod6_labs.benchmarks.mock_server import MockServer
+from mod6_labs.config import Config
+
+UNLIMITED = 1e9  # rate limiter tokens per second / burst for benchmarking
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Return p50/p95/p99 of ``samples`` (seconds) in milliseconds."""
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+    return {"p50_ms": at(0.50), "p95_ms": at(0.95), "p99_ms": at(0.99)}
+
+
+def summarize(name: str, operations: int, elapsed: float, latency: Dict[str, float], errors: int) -> Dict:
+    result = {
+        "workload": name,
+        "operations": operations,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "ops_per_sec": round(operations / elapsed, 1) if elapsed else 0.0,
+    }
+    result.update(latency)
+    return result
+
+
+def make_service():
+    """WeatherService aimed at the mock server, instrumented and not rate limited."""
+    from mod6_labs.instrumentation import Instrumentation
+    from mod6_labs.rate_limiter import RateLimiter
+    from mod6_labs.weather_service import WeatherService
+
+    return WeatherService(
+        rate_limiter=RateLimiter(UNLIMITED, UNLIMITED),
+        instrumentation=Instrumentation(enabled=True),
+    )
+
+
+async def bench_single(requests: int, concurrency: int) -> Dict:
+    service = make_service()
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: List[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await service.get_weather(f"Single{i}")
+            except Exception:
+                errors += 1
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    async with service:
+        await asyncio.gather(*(one(i) for i in range(requests)))
+    return summarize("single", requests, time.perf_counter() - start, percentiles(samples), errors)
+
+
+async def bench_watchlist(cities: int, rounds: int, concurrency: int) -> Dict:
+    service = make_service()
+    watchlist = [f"Watch{i}" for i in range(cities)]
+    samples: List[float] = []
+    errors = 0
+
+    async with service:
+        # Warm-up round teaches the service every city ID
+        await service.get_weather_many(watchlist, concurrency=concurrency)
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            service.cache.clear()
+            round_start = time.perf_counter()
+            results = await service.get_weather_many(watchlist, concurrency=concurrency)
+            samples.append(time.perf_counter() - round_start)
+            errors += sum(isinstance(r, Exception) for r in results)
+        elapsed = time.perf_counter() - start
+
+    result = summarize("watchlist", cities * rounds, elapsed, percentiles(samples), errors)
+    result["rounds"] = rounds
+    return result
+
+
+async def bench_batch(lines: int, concurrency: int) -> Dict:
+    from mod6_labs import batch
+
+    service = make_service()
+    source = io.StringIO("".join(f"Batch{i}\n" for i in range(lines)))
+    sink = io.StringIO()
+
+    start = time.perf_counter()
+    async with service:
+        counts = await batch.run(source, sink, concurrency=concurrency, service=service)
+    elapsed = time.perf_counter() - start
+
+    # Per-request latency of each /weather call, from the service's histograms
+    histogram = service.instrumentation.histograms.get("http.weather.total")
+    latency = histogram.summary() if histogram else {}
+    return summarize(
+        "batch",
+        lines,
+        elapsed,
+        {key: latency.get(key, 0.0) for key in ("p50_ms", "p95_ms", "p99_ms")},
+        counts["failed"],
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="WeatherService benchmark against the mock API.")
+    parser.add_argument("--workloads", default="single,watchlist,batch", help="comma-separated workloads")
+    parser.add_argument("--requests", type=int, default=500, help="single: number of requests")
+    parser.add_argument("--cities", type=int, default=100, help="watchlist: cities per refresh")
+    parser.add_argument("--rounds", type=int, default=20, help="watchlist: timed refreshes")
+    parser.add_argument("--lines", type=int, default=1000, help="batch: input lines")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight")
+    parser.add_argument("--latency", type=float, default=0.01, help="mock server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="mock server extra random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="mock server error fraction")
+    parser.add_argument("--payload-size", type=int, default=0, help="mock server padding bytes")
+    parser.add_argument("--json", help="append a JSON result line to this file")
+    args = parser.parse_args(argv)
+
+    with MockServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        payload_size=args.payload_size,
+    ) as server:
+        Config.API_KEY = "benchmark"
+        Config.BASE_URL = f"{server.base}/weather"
+        Config.FORECAST_URL = f"{server.base}/forecast"
+        Config.GROUP_URL = f"{server.base}/group"
+
+        workloads = {
+            "single": lambda: bench_single(args.requests, args.concurrency),
+            "watchlist": lambda: bench_watchlist(args.cities, args.rounds, args.concurrency),
+            "batch": lambda: bench_batch(args.lines, args.concurrency),
+        }
+        results = []
+        for name in args.workloads.split(","):
+            results.append(asyncio.run(workloads[name.strip()]()))
+        server_requests = server.settings.requests
+
+    print(f"{'workload':<10} {'ops':>7} {'errors':>7} {'ops/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        print(
+            f"{r['workload']:<10} {r['operations']:>7} {r['errors']:>7} {r['ops_per_sec']:>9.1f} "
+            f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f}"
+        )
+    print(f"\nMock server handled {server_requests} HTTP requests.")
+
+    if args.json:
+        with open(args.json, "a") as f:
+            f.write(json.dumps({
+                "timestamp": time.time(),
+                "settings": {
+                    "latency": args.latency,
+                    "jitter": args.jitter,
+                    "error_rate": args.error_rate,
+                    "payload_size": args.payload_size,
+                    "concurrency": args.concurrency,
+                },
+                "results": results,
+            }) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# cache.py
+"""In-memory response cache with per-entry TTL and LRU eviction."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a time-to-live.
+
+    Entries are kept in least-recently-used order; once ``max_size`` is
+    reached the oldest entry is evicted. Expired entries are dropped
+    lazily when they are looked up.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        default_ttl: float = 600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than zero")
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > self._clock()
+
+    def ttl_remaining(self, key: Hashable) -> Optional[float]:
+        """Seconds until ``key`` expires, or None if it is missing or expired.
+
+        Does not count as a lookup or refresh the entry's LRU position.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        remaining = entry[0] - self._clock()
+        return remaining if remaining > 0 else None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a cached value, counting the hit or miss.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            The cached value, or ``default``
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time-to-live in seconds (defaults to ``default_ttl``)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key and return its value (expired or not)."""
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries (statistics are kept)."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,228 @@
+# city_index.py
+"""Offline city-name index for autocomplete and name resolution.
+
+The index is a gzip-compressed, tab-separated file (search key, name,
+country, id) sorted by key, built from OpenWeather's published city list.
+No index ships with the app; download the list and build it with::
+
+    python -m mod6_labs.city_index --download mod6_labs/data/city_index.tsv.gz
+
+or from a copy of the list that is already on disk::
+
+    python -m mod6_labs.city_index city.list.json.gz mod6_labs/data/city_index.tsv.gz
+
+At runtime the rows are kept in one list sorted by the folded search key,
+so prefix lookups are a binary search plus a short slice. Keys are stored
+pre-folded so loading is a plain split per line.
+"""
+
+import bisect
+import gzip
+import json
+import os
+import sys
+import tempfile
+import threading
+import unicodedata
+from typing import List, NamedTuple, Optional
+
+CITY_LIST_URL = "https://bulk.openweathermap.org/sample/city.list.json.gz"
+
+
+class CityRecord(NamedTuple):
+    """Canonical city entry from the index."""
+    name: str
+    country: str
+    id: int
+
+    @property
+    def query(self) -> str:
+        """City query string understood by the OpenWeather API."""
+        return f"{self.name},{self.country}" if self.country else self.name
+
+    @property
+    def label(self) -> str:
+        """Display label, e.g. 'London, GB'."""
+        return f"{self.name}, {self.country}" if self.country else self.name
+
+
+def fold(text: str) -> str:
+    """Fold case, accents and whitespace for matching ('São  Paulo' -> 'sao paulo')."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.split()).casefold()
+
+
+class CityIndex:
+    """Sorted-array prefix index over city names.
+
+    The file is read lazily on first lookup (or explicitly with ``load()``,
+    e.g. from a worker thread) so it does not add to app startup time. A
+    missing file gives an empty index.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._keys: List[str] = []
+        self._records: List[CityRecord] = []
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self._records)
+
+    def load(self) -> "CityIndex":
+        """Read the index file once; later calls are no-ops."""
+        if self._loaded:
+            return self
+        with self._lock:
+            if self._loaded:
+                return self
+
+            keys, records = [], []
+            try:
+                with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        key, name, country, city_id = line.rstrip("\n").split("\t")
+                        keys.append(key)
+                        records.append(CityRecord(name, country, int(city_id)))
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                print(f"Error loading city index: {e}")
+                keys, records = [], []
+
+            self._keys = keys
+            self._records = records
+            self._loaded = True
+        return self
+
+    def suggest(self, prefix: str, limit: int = 5) -> List[CityRecord]:
+        """
+        Return cities whose name starts with ``prefix``.
+
+        Exact name matches come first, then the rest in alphabetical order.
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            Matching city records
+        """
+        key = fold(prefix)
+        if not key:
+            return []
+        self.load()
+
+        # Every key with this prefix sorts between key and key + U+FFFF;
+        # exact matches are the shortest, so they come first
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_right(self._keys, key + "\uffff", lo=start)
+        return self._records[start:min(end, start + limit)]
+
+    def matches(self, city: str) -> List[CityRecord]:
+        """
+        Return every record whose name equals ``city``.
+
+        A trailing ", CC" country code narrows the result. Only the last
+        comma-separated part is taken as the country, so a US state in
+        "Portland,OR,US" is ignored (the index has no states).
+        """
+        name, _, rest = city.partition(",")
+        key = fold(name)
+        country = rest.rpartition(",")[2].strip().upper()
+        if not key:
+            return []
+        self.load()
+
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_right(self._keys, key, lo=start)
+        records = self._records[start:end]
+        if country:
+            records = [r for r in records if r.country.upper() == country]
+        return records
+
+    def resolve(self, city: str) -> Optional[CityRecord]:
+        """
+        Resolve a typed name to a single canonical city.
+
+        Args:
+            city: City name, optionally followed by ", CC"
+
+        Returns:
+            The matching record, or None if the name is unknown or ambiguous
+        """
+        records = self.matches(city)
+        return records[0] if len(records) == 1 else None
+
+
+def build_index(source: str, destination: str) -> int:
+    """
+    Build a compact index file from OpenWeather's city.list.json(.gz).
+
+    Args:
+        source: Path to the downloaded city list
+        destination: Path of the .tsv.gz index to write
+
+    Returns:
+        Number of cities written
+    """
+    opener = gzip.open if source.endswith(".gz") else open
+    with opener(source, "rt", encoding="utf-8") as f:
+        cities = json.load(f)
+
+    rows = sorted(
+        {
+            (fold(c["name"]), c["name"], c.get("country", ""), int(c["id"]))
+            for c in cities
+            if c.get("name") and "\t" not in c["name"]
+        }
+    )
+    directory = os.path.dirname(destination)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with gzip.open(destination, "wt", encoding="utf-8") as f:
+        for key, name, country, city_id in rows:
+            f.write(f"{key}\t{name}\t{country}\t{city_id}\n")
+    return len(rows)
+
+
+def download_index(destination: str, url: str = CITY_LIST_URL) -> int:
+    """
+    Download OpenWeather's city list and build the index from it.
+
+    Args:
+        destination: Path of the .tsv.gz index to write
+        url: URL of city.list.json.gz
+
+    Returns:
+        Number of cities written
+    """
+    import httpx
+
+    fd, tmp = tempfile.mkstemp(suffix=".json.gz")
+    try:
+        with os.fdopen(fd, "wb") as f, httpx.stream("GET", url, timeout=60, follow_redirects=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_bytes():
+                f.write(chunk)
+        return build_index(tmp, destination)
+    finally:
+        os.remove(tmp)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m mod6_labs.city_index <city.list.json[.gz] | --download> <index.tsv.gz>")
+        sys.exit(1)
+    if sys.argv[1] == "--download":
+        count = download_index(sys.argv[2])
+    else:
+        count = build_index(sys.argv[1], sys.argv[2])
+    print(f"Wrote {count} cities to {sys.argv[2]}")
@@ -1,19 +1,60 @@
 # config.py
-"""Configuration management for the Weather App."""
+"""Configuration management for the Weather App.
+
+Environment-backed settings are resolved lazily: the .env file is only
+loaded (and python-dotenv only imported) the first time such a setting is
+read, and validation happens when the weather service is first created
+rather than at import time.
+"""
 
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+_env_loaded = False
+
+
+def _load_env():
+    """Load environment variables from the .env file (once)."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv  # deferred: only needed on first read
+        load_dotenv()
+        _env_loaded = True
+
+
+def _flag(value: str) -> bool:
+    """Parse a boolean environment value."""
+    return value.lower() in ("1", "true", "yes")
+
+
+class _Env:
+    """Class attribute read from the environment on first access.
+
+    The resolved value replaces the descriptor on the owning class, so
+    later reads are plain attribute lookups.
+    """
+
+    def __init__(self, name: str, default: str, cast=str):
+        self.name = name
+        self.default = default
+        self.cast = cast
+
+    def __set_name__(self, owner, attr):
+        self.attr = attr
+
+    def __get__(self, instance, owner):
+        _load_env()
+        value = self.cast(os.getenv(self.name, self.default))
+        setattr(owner, self.attr, value)
+        return value
+
 
 class Config:
     """Application configuration."""
     
     # API Configuration
-    API_KEY = os.getenv("OPENWEATHER_API_KEY", "")
-    BASE_URL = os.getenv(
-        "OPENWEATHER_BASE_URL", 
+    API_KEY = _Env("OPENWEATHER_API_KEY", "")
+    BASE_URL = _Env(
+        "OPENWEATHER_BASE_URL",
         "https://api.openweathermap.org/data/2.5/weather"
     )
     
@@ -23,8 +64,83 @@ class Config:
     APP_HEIGHT = 600
     
     # API Settings
-    UNITS = "metric"  # metric, imperial, or standard
+    UNITS = "metric"  # canonical units fetched and cached; converted at render time
+    DISPLAY_UNIT = _Env("WEATHER_DISPLAY_UNIT", "C")  # initial display unit: C, F or K
     TIMEOUT = 10  # seconds
+    FORECAST_URL = _Env(
+        "OPENWEATHER_FORECAST_URL",
+        "https://api.openweathermap.org/data/2.5/forecast"
+    )
+    GROUP_URL = _Env(
+        "OPENWEATHER_GROUP_URL",
+        "https://api.openweathermap.org/data/2.5/group"
+    )
+    GROUP_MAX_IDS = 20  # city IDs per group request
+    CITY_ID_CACHE_SIZE = 1000  # learned name -> ID mappings kept (LRU)
+    
+    # HTTP Connection Pool Settings
+    MAX_CONNECTIONS = _Env("WEATHER_MAX_CONNECTIONS", "20", int)
+    MAX_KEEPALIVE_CONNECTIONS = _Env("WEATHER_MAX_KEEPALIVE", "10", int)
+    KEEPALIVE_EXPIRY = _Env("WEATHER_KEEPALIVE_EXPIRY", "30", float)  # seconds
+    HTTP2 = _Env("WEATHER_HTTP2", "false", _flag)
+    
+    # Tail Latency Settings
+    DEADLINE = _Env("WEATHER_DEADLINE", "8", float)  # seconds per operation, retries included
+    MAX_RETRIES = 2  # retries for idempotent failures (network errors, 502/503/504)
+    RETRY_BACKOFF = 0.25  # seconds before the first retry, doubled each time
+    RETRY_BACKOFF_MAX = 2.0  # seconds
+    HEDGE_REQUESTS = _Env("WEATHER_HEDGE", "false", _flag)
+    HEDGE_QUANTILE = 0.95  # send a duplicate once the first request is slower than p95
+    HEDGE_MIN_DELAY = 0.05  # seconds
+    HEDGE_DEFAULT_DELAY = 1.0  # seconds, until enough latencies are recorded
+    
+    # Instrumentation (per-phase HTTP timings, parse/render spans)
+    INSTRUMENT = _Env("WEATHER_INSTRUMENT", "false", _flag)
+    METRICS_PATH = _Env("WEATHER_METRICS_PATH", "cache/metrics.json")  # written on exit
+    
+    # Client-side Rate Limit (free OpenWeather keys allow ~60 calls/minute)
+    RATE_LIMIT_CALLS = _Env("WEATHER_RATE_LIMIT_CALLS", "60", int)
+    RATE_LIMIT_PERIOD = 60  # seconds
+    RATE_LIMIT_BURST = _Env("WEATHER_RATE_LIMIT_BURST", "10", int)
+    
+    # Response Cache Settings
+    CACHE_MAX_SIZE = _Env("WEATHER_CACHE_MAX_SIZE", "256", int)
+    CURRENT_WEATHER_TTL = 10 * 60  # seconds
+    FORECAST_TTL = 60 * 60  # seconds
+    
+    # Persistent Cache Settings (stale entries are served, then refreshed)
+    DISK_CACHE_PATH = _Env("WEATHER_DISK_CACHE_PATH", "cache/weather_cache.db")
+    DISK_CACHE_MAX_ENTRIES = _Env("WEATHER_DISK_CACHE_MAX_ENTRIES", "1000", int)
+    DISK_CACHE_MAX_STALE = 24 * 60 * 60  # seconds past TTL before an entry is dropped
+    
+    # Offline City Index (build with: python -m mod6_labs.city_index --download <path>)
+    CITY_INDEX_PATH = _Env(
+        "WEATHER_CITY_INDEX_PATH",
+        os.path.join(os.path.dirname(__file__), "data", "city_index.tsv.gz")
+    )
+    AUTOCOMPLETE_LIMIT = 5
+    
+    # Current Location (IP geolocation, cached on disk)
+    GEO_CACHE_PATH = _Env("WEATHER_GEO_CACHE_PATH", "cache/location.json")
+    GEO_CACHE_TTL = 6 * 60 * 60  # seconds
+    GEO_GRID = 0.1  # degrees; nearby locations share one cell (and cache entry)
+    
+    # Local Assets (weather icons: python -m mod6_labs.icon_cache mod6_labs/assets/icons)
+    ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
+    ICON_CACHE_DIR = os.path.join(ASSETS_DIR, "icons")
+    
+    # Speculative Prefetch (background lane, never below the reserve)
+    PREFETCH_BUDGET = 10  # prefetches per window
+    PREFETCH_WINDOW = 60  # seconds
+    PREFETCH_RESERVE = 3  # rate limiter tokens left for interactive lookups
+    
+    # Watchlist Settings
+    WATCHLIST_PATH = _Env("WEATHER_WATCHLIST_PATH", "watchlist.json")
+    WATCHLIST_SAVE_DELAY = 0.5  # seconds to wait for more edits before writing
+    WATCHLIST_CONCURRENCY = _Env("WEATHER_WATCHLIST_CONCURRENCY", "8", int)  # 1 = sequential
+    WATCHLIST_REFRESH_INTERVAL = 5 * 60  # seconds (kept below CURRENT_WEATHER_TTL)
+    WATCHLIST_REFRESH_JITTER = 0.1  # +/- fraction of the interval
+    WATCHLIST_REFRESH_MAX_INTERVAL = 30 * 60  # back-off ceiling in seconds
     
     @classmethod
     def validate(cls):
@@ -35,6 +151,3 @@ class Config:
                 "Please create a .env file with your API key."
             )
         return True
-
-# Validate configuration on import
-Config.validate()
\ No newline at end of file
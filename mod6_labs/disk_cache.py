@@ -0,0 +1,188 @@
+# disk_cache.py
+"""Persistent SQLite-backed response store for the weather service."""
+
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class DiskCache:
+    """Key/value response store that survives app restarts.
+
+    Each entry has a freshness TTL and a hard expiry. Entries past their
+    TTL are still returned (flagged as stale) so callers can render them
+    immediately and refresh in the background; entries past the hard
+    expiry are never returned. The store is capped at ``max_entries``,
+    dropping the least recently used rows first.
+
+    Writes are not committed one by one: ``set()`` leaves its row in the
+    open transaction and ``get()`` only notes the access time in memory.
+    ``flush()`` writes the access times, enforces the size cap and commits
+    everything in one go (WeatherService calls it once per event-loop tick).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 1000,
+        max_stale: float = 24 * 60 * 60,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_stale = max_stale
+
+        # Statistics
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        # Encoded key -> last access time not yet written to the database
+        self._touched: Dict[str, float] = {}
+        self._dirty = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed "
+            "ON responses (accessed_at)"
+        )
+        self.conn.commit()
+        self.purge_expired()
+
+    @staticmethod
+    def _encode_key(key: Hashable) -> str:
+        """Serialize a (tuple) cache key to a stable string."""
+        return json.dumps(key, separators=(",", ":"))
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, bool, float]]:
+        """
+        Look up an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value, is_fresh, expires_at), or None if the key is
+            missing or past its hard expiry
+        """
+        now = time.time()
+        encoded = self._encode_key(key)
+        row = self.conn.execute(
+            "SELECT value, expires_at FROM responses WHERE key = ?",
+            (encoded,),
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = row
+        if now > expires_at + self.max_stale:
+            self.delete(key)
+            self.misses += 1
+            return None
+
+        self._touched[encoded] = now
+
+        is_fresh = now <= expires_at
+        if is_fresh:
+            self.fresh_hits += 1
+        else:
+            self.stale_hits += 1
+        return json.loads(value), is_fresh, expires_at
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        Store an entry; it is committed by the next ``flush()``.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl: Seconds the entry stays fresh
+        """
+        now = time.time()
+        encoded = self._encode_key(key)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, value, stored_at, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (encoded, json.dumps(value), now, now + ttl, now),
+        )
+        self._touched.pop(encoded, None)
+        self._dirty = True
+
+    def flush(self) -> None:
+        """Write pending access times, enforce the size cap and commit."""
+        if self._touched:
+            self.conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()],
+            )
+            self._touched.clear()
+            self._dirty = True
+        if not self._dirty:
+            return
+
+        self.conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY accessed_at DESC "
+            "LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self.conn.commit()
+        self._dirty = False
+
+    def delete(self, key: Hashable) -> None:
+        """Remove an entry."""
+        encoded = self._encode_key(key)
+        self._touched.pop(encoded, None)
+        self.conn.execute("DELETE FROM responses WHERE key = ?", (encoded,))
+        self.conn.commit()
+
+    def purge_expired(self) -> int:
+        """
+        Delete entries past their hard expiry.
+
+        Returns:
+            Number of rows removed
+        """
+        cursor = self.conn.execute(
+            "DELETE FROM responses WHERE expires_at + ? < ?",
+            (self.max_stale, time.time()),
+        )
+        self.conn.commit()
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        return {
+            "size": len(self),
+            "max_entries": self.max_entries,
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        """Commit pending writes and close the database connection."""
+        self.flush()
+        self.conn.close()
@@ -0,0 +1,212 @@
+# forecast_aggregation.py
+"""Vectorized daily aggregation of 5-day / 3-hour forecast responses.
+
+Forecasts are turned into NumPy arrays once, then every daily
+statistic is computed with ``reduceat`` passes over contiguous day groups
+instead of per-day Python lists. Nothing here depends on Flet, so it can
+be used headlessly for batch jobs over many cities.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Union
+
+import numpy as np
+
+from mod6_labs.weather_service import Forecast
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class ForecastArrays(NamedTuple):
+    """Column-oriented view of the forecast slots of one or more cities."""
+    dt: np.ndarray          # int64 UTC timestamps, ascending per city
+    local_day: np.ndarray   # int64 days since epoch in the city's local time
+    city: np.ndarray        # int64 index of the city each slot belongs to
+    temp: np.ndarray        # float64 temperatures
+    humidity: np.ndarray    # int64 relative humidity (%)
+    condition: np.ndarray   # int64 OpenWeather condition IDs
+    descriptions: Dict[int, str]  # condition ID -> description
+    icons: List[str]              # icon code per slot
+
+
+class DailyForecast(NamedTuple):
+    """Aggregated forecast for one local calendar day."""
+    date: str          # YYYY-MM-DD in the city's local time
+    high: float
+    low: float
+    humidity: int      # mean humidity, rounded down
+    description: str   # dominant condition of the day
+    icon: str
+
+
+def parse_forecast(data: Union[Forecast, Dict], city_index: int = 0) -> ForecastArrays:
+    """
+    Parse one forecast into arrays.
+
+    Args:
+        data: Forecast record, or a raw /forecast response
+        city_index: Index stored in the ``city`` column
+
+    Returns:
+        ForecastArrays for the forecast's slots
+    """
+    return parse_forecasts([data], first_index=city_index)
+
+
+def parse_forecasts(
+    forecasts: Iterable[Union[Forecast, Dict]],
+    first_index: int = 0,
+) -> ForecastArrays:
+    """
+    Parse several forecasts into one set of concatenated arrays.
+
+    Forecast records are already column-oriented, so their typed arrays
+    are wrapped without copying element by element; raw responses are
+    parsed into records first.
+
+    Args:
+        forecasts: Forecast records or raw /forecast responses
+        first_index: City index of the first forecast
+
+    Returns:
+        ForecastArrays covering every slot, grouped by city
+    """
+    dt, local_day, city, temp, humidity, condition = [], [], [], [], [], []
+    descriptions: Dict[int, str] = {}
+    icons: List[str] = []
+
+    for index, forecast in enumerate(forecasts, start=first_index):
+        if not isinstance(forecast, Forecast):
+            forecast = Forecast.from_response(forecast)
+        slots = len(forecast)
+        if not slots:
+            continue
+
+        times = np.frombuffer(forecast.dt, dtype=np.int64)
+        dt.append(times)
+        local_day.append((times + forecast.timezone) // SECONDS_PER_DAY)
+        city.append(np.full(slots, index, dtype=np.int64))
+        temp.append(np.frombuffer(forecast.temp, dtype=np.float64))
+        humidity.append(np.frombuffer(forecast.humidity, dtype=np.int64))
+        condition.append(np.frombuffer(forecast.condition, dtype=np.int64))
+        icons.extend(forecast.icons)
+        for condition_id, description in forecast.descriptions.items():
+            descriptions.setdefault(condition_id, description)
+
+    def join(parts: List[np.ndarray], dtype) -> np.ndarray:
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    return ForecastArrays(
+        dt=join(dt, np.int64),
+        local_day=join(local_day, np.int64),
+        city=join(city, np.int64),
+        temp=join(temp, np.float64),
+        humidity=join(humidity, np.int64),
+        condition=join(condition, np.int64),
+        descriptions=descriptions,
+        icons=icons,
+    )
+
+
+def aggregate(arrays: ForecastArrays, days: int = 5) -> List[List[DailyForecast]]:
+    """
+    Compute daily high, low, mean humidity and dominant condition.
+
+    Args:
+        arrays: Parsed forecast slots (one or more cities)
+        days: Maximum number of days to keep per city
+
+    Returns:
+        One list of DailyForecast per city, in city order
+    """
+    if arrays.dt.size == 0:
+        return []
+
+    # Slots are contiguous per (city, local day); find where each group starts
+    boundary = (np.diff(arrays.city) != 0) | (np.diff(arrays.local_day) != 0)
+    starts = np.concatenate(([0], np.flatnonzero(boundary) + 1))
+    counts = np.diff(np.append(starts, arrays.dt.size))
+    group = np.repeat(np.arange(starts.size), counts)
+
+    high = np.maximum.reduceat(arrays.temp, starts)
+    low = np.minimum.reduceat(arrays.temp, starts)
+    humidity = np.add.reduceat(arrays.humidity, starts) // counts
+
+    # Dominant condition: most frequent condition ID per group
+    conditions, condition_index = np.unique(arrays.condition, return_inverse=True)
+    tally = np.bincount(
+        group * conditions.size + condition_index,
+        minlength=starts.size * conditions.size,
+    ).reshape(starts.size, conditions.size)
+    dominant = tally.argmax(axis=1)
+
+    # Icon of the first slot in each group showing the dominant condition
+    slot = np.arange(arrays.dt.size)
+    candidates = np.where(condition_index == dominant[group], slot, arrays.dt.size)
+    icon_slot = np.minimum.reduceat(candidates, starts)
+
+    results: List[List[DailyForecast]] = []
+    group_city = arrays.city[starts]
+    group_day = arrays.local_day[starts]
+    for g in range(starts.size):
+        if not results or group_city[g] != group_city[g - 1]:
+            results.append([])
+        if len(results[-1]) >= days:
+            continue
+
+        condition_id = int(conditions[dominant[g]])
+        results[-1].append(
+            DailyForecast(
+                date=datetime.fromtimestamp(
+                    int(group_day[g]) * SECONDS_PER_DAY, tz=timezone.utc
+                ).date().isoformat(),
+                high=float(high[g]),
+                low=float(low[g]),
+                humidity=int(humidity[g]),
+                description=arrays.descriptions.get(condition_id, ""),
+                icon=arrays.icons[int(icon_slot[g])],
+            )
+        )
+    return results
+
+
+def aggregate_daily(data: Union[Forecast, Dict], days: int = 5) -> List[DailyForecast]:
+    """
+    Aggregate a single city's forecast into daily summaries.
+
+    Args:
+        data: Forecast record, or a raw /forecast response
+        days: Maximum number of days to return
+
+    Returns:
+        Daily forecasts in date order
+    """
+    per_city = aggregate(parse_forecast(data), days=days)
+    return per_city[0] if per_city else []
+
+
+def aggregate_many(
+    payloads: Iterable[Union[Forecast, Dict]],
+    days: int = 5,
+) -> List[List[DailyForecast]]:
+    """
+    Aggregate forecasts for many cities in one vectorized pass.
+
+    Args:
+        payloads: Forecast records or raw /forecast responses
+        days: Maximum number of days per city
+
+    Returns:
+        Daily forecasts per city, in input order (cities with no slots
+        get an empty list)
+    """
+    payloads = list(payloads)
+    arrays = parse_forecasts(payloads)
+    per_city = aggregate(arrays, days=days)
+
+    results: List[List[DailyForecast]] = [[] for _ in payloads]
+    if per_city:
+        present = np.unique(arrays.city)
+        for index, daily in zip(present, per_city):
+            results[int(index)] = daily
+    return results
@@ -0,0 +1,126 @@
+# geolocation.py
+"""Cached IP geolocation for the "my location" button.
+
+The location is resolved once (normally in the background at startup)
+through an IP geolocation API, snapped to a grid cell and stored on disk
+with a TTL, so later clicks need no geolocation request at all. Snapping
+makes nearby lookups produce identical coordinates, which therefore
+share one weather cache entry.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import NamedTuple, Optional
+
+GEOLOCATION_URL = "https://ipapi.co/json/"
+
+
+class Location(NamedTuple):
+    """Approximate location of this machine."""
+    lat: float
+    lon: float
+    city: str
+    country: str
+
+
+def snap(value: float, grid: float) -> float:
+    """Snap a coordinate to the centre of its ``grid``-degree cell."""
+    if grid <= 0:
+        return value
+    return round((value // grid) * grid + grid / 2, 6)
+
+
+class GeoLocator:
+    """Resolve and cache the current location."""
+
+    def __init__(self, path: Optional[str], ttl: float, grid: float = 0.1):
+        self.path = path
+        self.ttl = ttl
+        self.grid = grid
+        self._location: Optional[Location] = None
+        self._resolved_at = 0.0
+        self._pending: Optional[asyncio.Task] = None
+
+        self.lookups = 0
+        self.hits = 0
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._location is not None and time.time() - self._resolved_at < self.ttl
+
+    def load(self) -> Optional[Location]:
+        """
+        Read the cached location from disk.
+
+        Returns:
+            Cached location if it exists and has not expired, else None
+        """
+        if not self.path:
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            location = Location(
+                float(data["lat"]), float(data["lon"]), data.get("city", ""), data.get("country", "")
+            )
+            resolved_at = float(data["resolved_at"])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error loading cached location: {e}")
+            return None
+
+        if time.time() - resolved_at >= self.ttl:
+            return None
+        self._location, self._resolved_at = location, resolved_at
+        return location
+
+    def _save(self, location: Location, resolved_at: float) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({**location._asdict(), "resolved_at": resolved_at}, f)
+        os.replace(tmp, self.path)
+
+    async def locate(self, client) -> Location:
+        """
+        Return the current location, resolving it only when not cached.
+
+        Concurrent callers share a single lookup.
+
+        Args:
+            client: httpx.AsyncClient used if a lookup is needed
+
+        Returns:
+            Location snapped to the grid
+        """
+        if self.is_fresh or await asyncio.to_thread(self.load) is not None:
+            self.hits += 1
+            return self._location
+
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.create_task(self._resolve(client))
+        return await asyncio.shield(self._pending)
+
+    async def _resolve(self, client) -> Location:
+        self.lookups += 1
+        response = await client.get(GEOLOCATION_URL)
+        response.raise_for_status()
+        data = response.json()
+
+        location = Location(
+            snap(float(data["latitude"]), self.grid),
+            snap(float(data["longitude"]), self.grid),
+            data.get("city") or "",
+            data.get("country_code") or data.get("country") or "",
+        )
+        self._location, self._resolved_at = location, time.time()
+        if self.path:
+            try:
+                await asyncio.to_thread(self._save, location, self._resolved_at)
+            except OSError as e:
+                print(f"Error caching location: {e}")
+        return location
@@ -0,0 +1,181 @@
+# icon_cache.py
+"""Local, content-addressed cache of OpenWeather condition icons.
+
+Icons are stored under the Flet assets directory as ``icons/<sha256>.png``
+with a small ``icons/index.json`` manifest mapping icon codes (``"10d"``)
+to files, so identical day/night artwork is stored once. The directory
+is git-ignored; the app fills it on first run, or the full set can be
+downloaded ahead of time::
+
+    python -m mod6_labs.icon_cache mod6_labs/assets/icons
+
+At runtime ``src()`` resolves a code to its local asset path without any
+network access. Codes that are not cached yet fall back to the remote URL
+and are recorded in ``missing`` so the app can fetch them in the background.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+ICON_URL = "https://openweathermap.org/img/wn/{code}@2x.png"
+
+# Every condition icon OpenWeather uses, in day and night variants
+ICON_CODES = tuple(
+    f"{number}{variant}"
+    for number in ("01", "02", "03", "04", "09", "10", "11", "13", "50")
+    for variant in ("d", "n")
+)
+
+MANIFEST = "index.json"
+
+
+class IconCache:
+    """Maps icon codes to locally stored PNG files.
+
+    ``directory`` must live inside the Flet ``assets_dir``; ``prefix`` is
+    its path relative to that directory, used to build image sources.
+    """
+
+    def __init__(self, directory: str, prefix: str = "/icons"):
+        self.directory = directory
+        self.prefix = prefix.rstrip("/")
+        self._lock = threading.Lock()
+        self._files: Dict[str, str] = self._read_manifest()
+
+        self.missing: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _read_manifest(self) -> Dict[str, str]:
+        try:
+            with open(os.path.join(self.directory, MANIFEST), encoding="utf-8") as f:
+                files = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {
+            code: name for code, name in files.items()
+            if os.path.exists(os.path.join(self.directory, name))
+        }
+
+    def _write_manifest(self) -> None:
+        path = os.path.join(self.directory, MANIFEST)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._files, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def src(self, code: str) -> str:
+        """
+        Resolve an icon code to an ``ft.Image`` source.
+
+        Args:
+            code: OpenWeather icon code, e.g. ``"10d"``
+
+        Returns:
+            Local asset path if the icon is cached, otherwise the remote URL
+        """
+        name = self._files.get(code)
+        if name is not None:
+            self.hits += 1
+            return f"{self.prefix}/{name}"
+
+        self.misses += 1
+        self.missing.add(code)
+        return ICON_URL.format(code=code)
+
+    def store(self, code: str, data: bytes) -> str:
+        """
+        Save icon bytes under their content hash and record the code.
+
+        Args:
+            code: OpenWeather icon code
+            data: PNG bytes
+
+        Returns:
+            File name of the stored icon
+        """
+        name = f"{hashlib.sha256(data).hexdigest()}.png"
+        path = os.path.join(self.directory, name)
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if not os.path.exists(path):
+                tmp = f"{path}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            self._files[code] = name
+            self.missing.discard(code)
+            self._write_manifest()
+        return name
+
+    def uncached(self, codes: Iterable[str] = ICON_CODES) -> List[str]:
+        """Return the codes (all known ones by default) not stored locally."""
+        return [code for code in dict.fromkeys(codes) if code not in self._files]
+
+    async def fetch_missing(self, client, codes: Optional[Iterable[str]] = None) -> int:
+        """
+        Download icons that are not cached yet.
+
+        Args:
+            client: httpx.AsyncClient used for the downloads
+            codes: Codes to fetch; defaults to every icon seen as a miss
+
+        Returns:
+            Number of icons stored
+        """
+        pending = self.uncached(self.missing if codes is None else codes)
+        errors: List[Exception] = []
+
+        async def fetch(code: str) -> bool:
+            try:
+                response = await client.get(ICON_URL.format(code=code))
+                response.raise_for_status()
+            except Exception as e:
+                errors.append(e)
+                return False
+            await asyncio.to_thread(self.store, code, response.content)
+            return True
+
+        results = await asyncio.gather(*(fetch(code) for code in pending))
+        if errors:
+            # One line, not one per icon (e.g. every icon fails when offline)
+            print(f"Error downloading {len(errors)} of {len(pending)} icons: {errors[0]}")
+        return sum(results)
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and lookup counters."""
+        return {
+            "icons": len(self._files),
+            "files": len(set(self._files.values())),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+async def download_all(directory: str) -> int:
+    """Download the full icon set into ``directory``."""
+    import httpx
+
+    cache = IconCache(directory)
+    async with httpx.AsyncClient(timeout=10) as client:
+        return await cache.fetch_missing(client, ICON_CODES)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m mod6_labs.icon_cache <assets/icons directory>")
+        sys.exit(1)
+    count = asyncio.run(download_all(sys.argv[1]))
+    print(f"Stored {count} icons in {sys.argv[1]}")
@@ -0,0 +1,194 @@
+# instrumentation.py
+"""Timing spans, HTTP phase hooks and compact latency histograms.
+
+``Instrumentation`` collects durations into named ``Histogram`` objects:
+
+- ``http.<endpoint>.<phase>`` from httpx event hooks and httpcore trace
+  events (connect, tls, send, wait, receive, total), where endpoint is
+  the last URL path segment (weather, forecast, group)
+- ``parse.<endpoint>`` around JSON parsing in WeatherService
+- ``render.<method>`` around WeatherApp's display_* methods
+
+Histograms are HDR-style: values are bucketed log-linearly in
+microseconds with 128 sub-buckets per power of two, so memory is bounded
+and percentiles are within about 1% of the exact value. ``snapshot()``
+returns count, mean, p50/p95/p99 and max per metric in milliseconds;
+``dump()`` writes it to a JSON file. When disabled, spans and hooks cost
+a single attribute check.
+"""
+
+import atexit
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Optional
+
+SUB_BUCKET_BITS = 7  # 128 sub-buckets per power of two
+
+
+class Histogram:
+    """Log-linear histogram of durations."""
+
+    def __init__(self):
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def _key(micros: int) -> int:
+        shift = max(0, micros.bit_length() - SUB_BUCKET_BITS - 1)
+        return (shift << (SUB_BUCKET_BITS + 1)) | (micros >> shift)
+
+    @staticmethod
+    def _value(key: int) -> float:
+        shift = key >> (SUB_BUCKET_BITS + 1)
+        top = key & ((1 << (SUB_BUCKET_BITS + 1)) - 1)
+        # Midpoint of the bucket, in seconds
+        return ((top << shift) + (1 << shift) / 2) / 1e6 if shift else top / 1e6
+
+    def record(self, seconds: float) -> None:
+        """Add one duration in seconds."""
+        key = self._key(max(1, int(seconds * 1e6)))
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, quantile: float) -> float:
+        """Return the duration (seconds) at ``quantile``, or 0.0 if empty."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(quantile * self.count)))
+        seen = 0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if seen >= rank:
+                return min(self._value(key), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Return count, mean, p50/p95/p99 and max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+# httpcore trace event prefix -> reported phase
+TRACE_PHASES = {
+    "connect_tcp": "connect",
+    "connect_unix_socket": "connect",
+    "start_tls": "tls",
+    "send_request_headers": "send",
+    "receive_response_headers": "wait",
+    "receive_response_body": "receive",
+}
+
+
+class Instrumentation:
+    """Registry of latency histograms with span and httpx hook helpers."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms: Dict[str, Histogram] = {}
+        self._dump_path: Optional[str] = None
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one duration under ``name``."""
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.record(seconds)
+
+    def span(self, name: str):
+        """Context manager timing its body into the ``name`` histogram."""
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name)
+
+    @contextmanager
+    def _span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def event_hooks(self) -> Dict[str, list]:
+        """
+        Build ``event_hooks`` for an httpx.AsyncClient.
+
+        The request hook attaches an httpcore trace callback that times
+        each connection phase (connect, tls, send, wait for headers,
+        receive body); the whole request is recorded as ``total``.
+        """
+        if not self.enabled:
+            return {}
+
+        async def on_request(request) -> None:
+            endpoint = request.url.path.rstrip("/").rsplit("/", 1)[-1] or "root"
+            start = time.perf_counter()
+            started: Dict[str, float] = {}
+
+            async def trace(event: str, info: Dict[str, Any]) -> None:
+                step, _, stage = event.rpartition(".")
+                phase = TRACE_PHASES.get(step.rsplit(".", 1)[-1])
+                now = time.perf_counter()
+                if phase is None:
+                    return
+                if stage == "started":
+                    started[step] = now
+                elif stage in ("complete", "failed") and step in started:
+                    self.record(f"http.{endpoint}.{phase}", now - started.pop(step))
+                    if phase == "receive" and stage == "complete":
+                        self.record(f"http.{endpoint}.total", now - start)
+
+            request.extensions["trace"] = trace
+
+        return {"request": [on_request]}
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return a summary of every histogram, keyed by metric name."""
+        return {name: self.histograms[name].summary() for name in sorted(self.histograms)}
+
+    def dump(self, path: str) -> None:
+        """Write the snapshot to ``path`` as JSON (atomically)."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": time.time(), "metrics": self.snapshot()}, f, indent=2)
+        os.replace(tmp, path)
+
+    def dump_on_exit(self, path: str) -> None:
+        """Dump the snapshot to ``path`` when the interpreter exits."""
+        if self._dump_path is None:
+            atexit.register(self._dump_at_exit)
+        self._dump_path = path
+
+    def _dump_at_exit(self) -> None:
+        if self._dump_path and self.histograms:
+            try:
+                self.dump(self._dump_path)
+            except OSError as e:
+                print(f"Error writing metrics: {e}")
+
+
+def timed(name: str) -> Callable:
+    """Decorate a method to time it with ``self.instrumentation.span(name)``."""
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.instrumentation.span(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
@@ -2,12 +2,23 @@
 """Weather Application using Flet v0.28.3"""
 
 import flet as ft
-from mod6_labs.weather_service import WeatherService
+from mod6_labs.city_index import CityIndex
+from mod6_labs.geolocation import GeoLocator
+from mod6_labs.icon_cache import IconCache
+from mod6_labs.instrumentation import Instrumentation, timed
+from mod6_labs.update_batcher import UpdateBatcher
+from mod6_labs.watchlist_store import WatchlistStore
+from mod6_labs.scheduler import RefreshScheduler
+from mod6_labs.units import format_speed, format_temperature, next_unit, normalize_unit
 from mod6_labs.config import Config
+from typing import TYPE_CHECKING
 import asyncio
-import httpx
-import json
-import os
+
+# The service layer (httpx, sqlite, numpy) is imported on first use so the
+# first frame renders before the network stack is loaded
+if TYPE_CHECKING:
+    from mod6_labs.prefetch import Prefetcher
+    from mod6_labs.weather_service import Forecast, WeatherService, WeatherSnapshot
 
 
 class WeatherApp:
@@ -15,13 +26,182 @@ class WeatherApp:
     
     def __init__(self, page: ft.Page):
         self.page = page
-        self.weather_service = WeatherService()
+        self.updates = UpdateBatcher.for_page(page)  # one page.update() per loop tick
+        self.city_index = CityIndex(Config.CITY_INDEX_PATH)
+        self.icon_cache = IconCache(Config.ICON_CACHE_DIR)
+        self.geolocator = GeoLocator(
+            Config.GEO_CACHE_PATH, ttl=Config.GEO_CACHE_TTL, grid=Config.GEO_GRID
+        )
+        self.instrumentation = Instrumentation(enabled=Config.INSTRUMENT)
+        if self.instrumentation.enabled:
+            self.instrumentation.dump_on_exit(Config.METRICS_PATH)
+        self._weather_service = None
+        self._prefetcher = None
+        self._autocomplete_prefetch = None
         self.search_history = []
         self.watchlist = []
-        self.watchlist_file = "watchlist.json"
+        
+        # Data is cached in metric units and converted when rendered
+        self.unit = normalize_unit(Config.DISPLAY_UNIT)  # unknown values fall back to °C
+        self.last_view = None  # (display method, args) of what is on screen
+        self.watchlist_store = WatchlistStore(
+            Config.WATCHLIST_PATH, delay=Config.WATCHLIST_SAVE_DELAY
+        )
         self.load_watchlist()
         self.setup_page()
         self.build_ui()
+        
+        # Release pooled HTTP connections when the session ends
+        self.page.on_close = self.on_close
+        
+        # Load the city index off the UI thread after the first frame
+        self.page.run_task(self.preload_city_index)
+        
+        # Download any weather icons that are not bundled yet
+        self.page.run_task(self.fetch_missing_icons)
+        
+        # Resolve the current location and warm its weather in the background
+        self.page.run_task(self.prefetch_location_weather)
+        
+        # Keep watchlist readings warm in the background
+        self.refresh_scheduler = RefreshScheduler(
+            self.refresh_watchlist,
+            interval=Config.WATCHLIST_REFRESH_INTERVAL,
+            jitter=Config.WATCHLIST_REFRESH_JITTER,
+            max_interval=Config.WATCHLIST_REFRESH_MAX_INTERVAL,
+        )
+        self.page.on_app_lifecycle_state_change = self.on_lifecycle_change
+        self.page.run_task(self.refresh_scheduler.run)
+    
+    @property
+    def weather_service(self) -> "WeatherService":
+        """Weather service, created (and its modules imported) on first use."""
+        if self._weather_service is None:
+            from mod6_labs.weather_service import WeatherService
+            self._weather_service = WeatherService(
+                disk_cache=self.open_disk_cache(),
+                city_index=self.city_index,
+                instrumentation=self.instrumentation,
+            )
+        return self._weather_service
+    
+    @property
+    def prefetcher(self) -> "Prefetcher":
+        """Background cache warmer, created on first use."""
+        if self._prefetcher is None:
+            from mod6_labs.prefetch import Prefetcher
+            from mod6_labs.rate_limiter import Priority
+            self._prefetcher = Prefetcher(
+                fetch=lambda city: self.weather_service.get_city_bundle(
+                    city, priority=Priority.BACKGROUND
+                ),
+                is_cached=lambda city: (
+                    self.weather_service.is_fresh("weather", city)
+                    and self.weather_service.is_fresh("forecast", city)
+                ),
+                rate_limiter=self.weather_service.rate_limiter,
+                budget=Config.PREFETCH_BUDGET,
+                window=Config.PREFETCH_WINDOW,
+                reserve=Config.PREFETCH_RESERVE,
+                cost=2,  # each prefetch is a bundle: current weather and forecast
+            )
+        return self._prefetcher
+    
+    def prefetch(self, *cities: str):
+        """Queue cities for low-priority prefetching."""
+        queries = [self.index_query(city) for city in cities]
+        self.page.run_task(self.request_prefetch, [q for q in queries if q])
+    
+    async def request_prefetch(self, queries: list):
+        """Hand queries to the prefetcher on the event loop."""
+        for query in queries:
+            self.prefetcher.request(query)
+    
+    def open_disk_cache(self):
+        """Open the persistent weather cache, or None if it is disabled."""
+        if not Config.DISK_CACHE_PATH:
+            return None
+        try:
+            from mod6_labs.disk_cache import DiskCache
+            return DiskCache(
+                Config.DISK_CACHE_PATH,
+                max_entries=Config.DISK_CACHE_MAX_ENTRIES,
+                max_stale=Config.DISK_CACHE_MAX_STALE,
+            )
+        except Exception as e:
+            print(f"Error opening weather cache: {e}")
+            return None
+    
+    async def preload_city_index(self):
+        """Load the offline city index in a worker thread."""
+        await asyncio.to_thread(self.city_index.load)
+    
+    async def fetch_missing_icons(self):
+        """Download uncached weather icons once so later renders stay local."""
+        if not self.icon_cache.uncached():
+            return
+        try:
+            # Icons are public; a short-lived client avoids needing an API key
+            import httpx
+            async with httpx.AsyncClient(timeout=10) as client:
+                await self.icon_cache.fetch_missing(client, self.icon_cache.uncached())
+        except Exception as e:
+            print(f"Error caching weather icons: {e}")
+    
+    async def prefetch_location_weather(self):
+        """Resolve the current location once and cache its weather."""
+        from mod6_labs.rate_limiter import Priority
+        
+        try:
+            location = await self.geolocator.locate(self.weather_service.open())
+            await self.weather_service.get_weather_by_coordinates(
+                location.lat, location.lon, priority=Priority.BACKGROUND
+            )
+        except Exception as e:
+            print(f"Error prefetching location weather: {e}")
+    
+    # Both handlers are async so Flet runs them on the event loop: the
+    # scheduler's asyncio events and the prefetch task belong to that loop
+    # and must not be touched from the handler thread pool
+    async def on_close(self, e):
+        """Close the shared weather service client when the session ends."""
+        self.refresh_scheduler.stop()
+        if self._prefetcher is not None:
+            self._prefetcher.cancel()
+        await self.watchlist_store.flush()
+        if self._weather_service is not None:
+            await self._weather_service.aclose()
+    
+    async def on_lifecycle_change(self, e):
+        """Pause background refreshes while the window is hidden."""
+        if e.state in (ft.AppLifecycleState.HIDE, ft.AppLifecycleState.PAUSE):
+            self.refresh_scheduler.pause()
+        elif e.state in (ft.AppLifecycleState.SHOW, ft.AppLifecycleState.RESUME):
+            self.refresh_scheduler.resume()
+    
+    async def refresh_watchlist(self):
+        """Refresh cached weather for every watchlist city."""
+        if not self.watchlist:
+            return
+        
+        from mod6_labs.weather_service import RateLimitError
+        
+        # Re-request entries that would expire before the next run, so
+        # Compare Cities keeps finding them fresh between refreshes
+        scheduler = self.refresh_scheduler
+        results = await self.weather_service.get_weather_many(
+            list(self.watchlist),
+            concurrency=Config.WATCHLIST_CONCURRENCY,
+            refresh_ahead=scheduler.interval * (1 + scheduler.jitter),
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        
+        # Let the scheduler back off when throttled or when nothing worked
+        for error in errors:
+            if isinstance(error, RateLimitError):
+                raise error
+        if errors and len(errors) == len(results):
+            raise errors[0]
     
     def setup_page(self):
         """Configure page settings."""
@@ -67,6 +247,13 @@ class WeatherApp:
             on_click=self.toggle_theme,
         )
         
+        # Unit toggle button (°C -> °F -> K), converts locally without a request
+        self.unit_button = ft.TextButton(
+            self.unit_label(),
+            tooltip="Change units",
+            on_click=self.toggle_unit,
+        )
+        
         # Update the Column to include the theme button in the title row
         title_row = ft.Row(
             [
@@ -74,6 +261,7 @@ class WeatherApp:
                 ft.Row(
                     [
                         self.location_button,
+                        self.unit_button,
                         self.theme_button,
                     ],
                     spacing=10,
@@ -90,8 +278,12 @@ class WeatherApp:
             prefix_icon=ft.Icons.LOCATION_CITY,
             autofocus=True,
             on_submit=self.on_search,
+            on_change=self.on_city_input_change,
         )
         
+        # Autocomplete suggestions from the offline city index
+        self.suggestions_column = ft.Column(spacing=0, visible=False)
+        
         # Search history dropdown
         self.history_dropdown = self.build_history_dropdown()
         
@@ -147,6 +339,9 @@ class WeatherApp:
             padding=20,
         )
         
+        # Current-weather view, built once and updated in place per search
+        self.build_weather_view()
+        
         # Error message
         self.error_message = ft.Text(
             "",
@@ -157,11 +352,16 @@ class WeatherApp:
         # Loading indicator
         self.loading = ft.ProgressRing(visible=False)
         
-        # Watchlist section
+        # Watchlist section (one retained row per city, keyed by name)
+        self.watchlist_rows = {}
+        self.watchlist_empty = ft.Text("No cities in watchlist", color=ft.Colors.GREY_600)
+        self.watchlist_list = ft.Column([self.watchlist_empty], spacing=10)
+        self.update_watchlist_ui()
         self.watchlist_column = ft.Column(
             [
                 ft.Text("Watchlist", size=16, weight=ft.FontWeight.BOLD),
                 ft.Divider(height=10, color=ft.Colors.TRANSPARENT),
+                self.watchlist_list,
             ],
             spacing=10,
         )
@@ -174,6 +374,7 @@ class WeatherApp:
                     ft.Divider(height=20, color=ft.Colors.TRANSPARENT),
                     self.history_dropdown,
                     self.city_input,
+                    self.suggestions_column,
                     ft.Row(
                         [self.search_button, add_watchlist_button, comparison_button, forecast_button],
                         spacing=10,
@@ -192,8 +393,90 @@ class WeatherApp:
     
     def on_search(self, e):
         """Handle search button click or enter key press."""
+        self.suggestions_column.visible = False
         self.page.run_task(self.get_weather)
     
+    def on_city_input_change(self, e):
+        """Show autocomplete suggestions for the typed city name."""
+        # Never block typing on the index; suggestions appear once it is loaded
+        if not self.city_index.loaded:
+            return
+        
+        suggestions = self.city_index.suggest(
+            self.city_input.value, limit=Config.AUTOCOMPLETE_LIMIT
+        )
+        self.suggestions_column.controls = [
+            ft.TextButton(
+                record.label,
+                on_click=lambda e, r=record: self.select_suggestion(r),
+            )
+            for record in suggestions
+        ]
+        self.suggestions_column.visible = bool(suggestions)
+        self.updates.request()
+        
+        # Warm the top candidate once the prefix is specific enough
+        if suggestions and len(self.city_input.value.strip()) >= 3:
+            self.page.run_task(self.prefetch_suggestion, suggestions[0].query)
+    
+    async def prefetch_suggestion(self, query: str):
+        """Prefetch the top autocomplete match, replacing the previous one."""
+        if query == self._autocomplete_prefetch:
+            return
+        if self._autocomplete_prefetch is not None:
+            self.prefetcher.discard(self._autocomplete_prefetch)
+        self._autocomplete_prefetch = query
+        self.prefetcher.request(query)
+    
+    def select_suggestion(self, record):
+        """Fill the city input with a suggestion and search for it."""
+        self.city_input.value = record.label
+        self.suggestions_column.visible = False
+        self.page.run_task(self.get_weather)
+    
+    def index_query(self, city: str):
+        """
+        Look a typed city name up in the offline index.
+        
+        Returns the API query for the city, the typed name if the index is
+        unavailable or the name is ambiguous, or None when the index knows
+        no such city.
+        """
+        if not self.city_index.loaded or len(self.city_index) == 0:
+            return city
+        
+        matches = self.city_index.matches(city)
+        if len(matches) == 1:
+            return matches[0].query
+        return city if matches else None
+    
+    def resolve_city(self, city: str):
+        """
+        Resolve a typed city name against the offline index.
+        
+        Like index_query(), but shows an error (with suggestions) when the
+        index knows no such city.
+        """
+        query = self.index_query(city)
+        if query is not None:
+            return query
+        
+        suggestions = self.city_index.suggest(city.partition(",")[0], limit=3)
+        message = f"City '{city}' not found. Please check the spelling."
+        if suggestions:
+            message += " Did you mean: " + ", ".join(r.label for r in suggestions) + "?"
+        self.show_error(message)
+        return None
+    
+    async def warm_cache(self, fetch, query: str):
+        """Fetch ``query`` into the cache on the background lane, ignoring errors."""
+        from mod6_labs.rate_limiter import Priority
+        
+        try:
+            await fetch(query, priority=Priority.BACKGROUND)
+        except Exception:
+            pass  # The view that needs it fetches again and reports the error
+    
     async def get_weather(self):
         """Fetch and display weather data."""
         city = self.city_input.value.strip()
@@ -203,15 +486,23 @@ class WeatherApp:
             self.show_error("Please enter a city name")
             return
         
+        # Catch misspellings locally before any request goes out
+        query = self.resolve_city(city)
+        if query is None:
+            return
+        
         # Show loading, hide previous results
         self.loading.visible = True
         self.error_message.visible = False
         self.weather_container.visible = False
-        self.page.update()
+        self.updates.request()
         
         try:
-            # Fetch weather data
-            weather_data = await self.weather_service.get_weather(city)
+            # Warm the forecast alongside, but render as soon as the
+            # current conditions arrive
+            self.prefetcher.record_use(query)
+            self.page.run_task(self.warm_cache, self.weather_service.get_forecast, query)
+            weather_data = await self.weather_service.get_weather(query)
             
             # Add to search history
             self.add_to_history(city)
@@ -225,19 +516,14 @@ class WeatherApp:
         
         finally:
             self.loading.visible = False
-            self.page.update()
+            self.updates.request()
     
-    def display_weather(self, data: dict):
+    @timed("render.display_weather")
+    def display_weather(self, snapshot: "WeatherSnapshot"):
         """Display weather information."""
-        # Extract data
-        city_name = data.get("name", "Unknown")
-        country = data.get("sys", {}).get("country", "")
-        temp = data.get("main", {}).get("temp", 0)
-        feels_like = data.get("main", {}).get("feels_like", 0)
-        humidity = data.get("main", {}).get("humidity", 0)
-        description = data.get("weather", [{}])[0].get("description", "").title()
-        icon_code = data.get("weather", [{}])[0].get("icon", "01d")
-        wind_speed = data.get("wind", {}).get("speed", 0)
+        # Alert thresholds use the canonical metric values (°C, m/s)
+        temp = snapshot.temp
+        wind_speed = snapshot.wind_speed
         
         # Check for extreme conditions and show alerts
         if temp > 35:
@@ -265,85 +551,115 @@ class WeatherApp:
             self.page.banner = alert
             self.page.banner.open = True
         
-        # Build weather display
-        self.weather_container.content = ft.Column(
+        # Update only the values that changed since the last search
+        self.update_weather_view(self.weather_view_values(snapshot))
+        self.last_view = (self.display_weather, (snapshot,))
+        
+        # Forecast and watchlist views replace the container content
+        if self.weather_container.content is not self.weather_view:
+            self.weather_container.content = self.weather_view
+        
+        # Add animation to container
+        self.weather_container.animate_opacity = 300
+        self.weather_container.opacity = 0
+        self.weather_container.visible = True
+        self.error_message.visible = False
+        self.updates.request()
+        
+        # Fade in animation
+        self.page.run_task(self.fade_in_weather)
+    
+    def weather_view_values(self, snapshot: "WeatherSnapshot") -> dict:
+        """Format a snapshot for the current-weather view in the display unit."""
+        return {
+            "location": f"{snapshot.name}, {snapshot.country}",
+            "icon": self.icon_cache.src(snapshot.icon),
+            "description": snapshot.description,
+            "temp": format_temperature(snapshot.temp, self.unit),
+            "feels_like": f"Feels like {format_temperature(snapshot.feels_like, self.unit)}",
+            "humidity": f"{snapshot.humidity}%",
+            "wind": format_speed(snapshot.wind_speed, self.unit),
+        }
+    
+    def build_weather_view(self):
+        """Build the current-weather control tree once."""
+        self.weather_location = ft.Text("", size=24, weight=ft.FontWeight.BOLD)
+        self.weather_icon = ft.Image(src="", width=100, height=100)
+        self.weather_description = ft.Text("", size=20, italic=True)
+        self.weather_temp = ft.Text(
+            "",
+            size=48,
+            weight=ft.FontWeight.BOLD,
+            color=ft.Colors.BLUE_900,
+        )
+        self.weather_feels_like = ft.Text("", size=16, color=ft.Colors.GREY_700)
+        humidity_card = self.create_info_card(ft.Icons.WATER_DROP, "Humidity", "")
+        wind_card = self.create_info_card(ft.Icons.AIR, "Wind Speed", "")
+        
+        # Field name -> (control, attribute) written by update_weather_view
+        self.weather_fields = {
+            "location": (self.weather_location, "value"),
+            "icon": (self.weather_icon, "src"),
+            "description": (self.weather_description, "value"),
+            "temp": (self.weather_temp, "value"),
+            "feels_like": (self.weather_feels_like, "value"),
+            "humidity": (humidity_card.content.controls[2], "value"),
+            "wind": (wind_card.content.controls[2], "value"),
+        }
+        self.weather_values = {}
+        
+        self.weather_view = ft.Column(
             [
                 # Location
-                ft.Text(
-                    f"{city_name}, {country}",
-                    size=24,
-                    weight=ft.FontWeight.BOLD,
-                ),
+                self.weather_location,
                 
                 # Weather icon and description
                 ft.Row(
-                    [
-                        ft.Image(
-                            src=f"https://openweathermap.org/img/wn/{icon_code}@2x.png",
-                            width=100,
-                            height=100,
-                        ),
-                        ft.Text(
-                            description,
-                            size=20,
-                            italic=True,
-                        ),
-                    ],
+                    [self.weather_icon, self.weather_description],
                     alignment=ft.MainAxisAlignment.CENTER,
                 ),
                 
                 # Temperature
-                ft.Text(
-                    f"{temp:.1f}°C",
-                    size=48,
-                    weight=ft.FontWeight.BOLD,
-                    color=ft.Colors.BLUE_900,
-                ),
-                
-                ft.Text(
-                    f"Feels like {feels_like:.1f}°C",
-                    size=16,
-                    color=ft.Colors.GREY_700,
-                ),
+                self.weather_temp,
+                self.weather_feels_like,
                 
                 ft.Divider(),
                 
                 # Additional info
                 ft.Row(
-                    [
-                        self.create_info_card(
-                            ft.Icons.WATER_DROP,
-                            "Humidity",
-                            f"{humidity}%"
-                        ),
-                        self.create_info_card(
-                            ft.Icons.AIR,
-                            "Wind Speed",
-                            f"{wind_speed} m/s"
-                        ),
-                    ],
+                    [humidity_card, wind_card],
                     alignment=ft.MainAxisAlignment.SPACE_EVENLY,
                 ),
             ],
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
             spacing=10,
         )
+    
+    def update_weather_view(self, values: dict) -> list:
+        """
+        Write new display values into the retained weather view.
         
-        # Add animation to container
-        self.weather_container.animate_opacity = 300
-        self.weather_container.opacity = 0
-        self.weather_container.visible = True
-        self.error_message.visible = False
-        self.page.update()
-        
-        # Fade in animation
-        self.page.run_task(self.fade_in_weather)
+        Args:
+            values: Formatted value per field name of weather_fields
+            
+        Returns:
+            Names of the fields that changed
+        """
+        changed = [
+            name for name, value in values.items()
+            if self.weather_values.get(name) != value
+        ]
+        for name in changed:
+            control, attribute = self.weather_fields[name]
+            setattr(control, attribute, values[name])
+            self.weather_values[name] = values[name]
+        return changed
     
     async def fade_in_weather(self):
         """Fade in the weather container."""
         await asyncio.sleep(0.1)
         self.weather_container.opacity = 1
-        self.page.update()
+        self.updates.request()
     
     def create_info_card(self, icon, label, value):
         """Create an info card for weather details."""
@@ -373,7 +689,8 @@ class WeatherApp:
         self.error_message.value = f"❌ {message}"
         self.error_message.visible = True
         self.weather_container.visible = False
-        self.page.update()
+        self.last_view = None
+        self.updates.request()
     
     def toggle_theme(self, e):
         """Toggle between light and dark theme."""
@@ -383,7 +700,26 @@ class WeatherApp:
         else:
             self.page.theme_mode = ft.ThemeMode.LIGHT
             self.theme_button.icon = ft.Icons.DARK_MODE
-        self.page.update()
+        self.updates.request()
+    
+    def unit_label(self) -> str:
+        return "K" if self.unit == "K" else f"°{self.unit}"
+    
+    def toggle_unit(self, e):
+        """Switch the display unit and re-render the current view locally."""
+        self.unit = next_unit(self.unit)
+        self.unit_button.text = self.unit_label()
+        
+        # Only redraw a view that is on screen, not one hidden by a load
+        if self.last_view is not None and self.weather_container.visible:
+            display, args = self.last_view
+            if display == self.display_weather:
+                # Retained view: only the temperature and wind texts change
+                self.update_weather_view(self.weather_view_values(*args))
+            else:
+                display(*args)
+                self.weather_container.opacity = 1  # redraw in place, no fade
+        self.updates.request()
     
     def add_to_history(self, city: str):
         """Add city to search history."""
@@ -397,6 +733,7 @@ class WeatherApp:
             label="Recent Searches",
             options=[ft.dropdown.Option(city) for city in self.search_history],
             on_change=self.load_from_history,
+            on_focus=lambda e: self.prefetch(*self.search_history),
             width=300,
         )
     
@@ -405,7 +742,7 @@ class WeatherApp:
         self.history_dropdown.options = [
             ft.dropdown.Option(city) for city in self.search_history
         ]
-        self.page.update()
+        self.updates.request()
     
     def load_from_history(self, e):
         """Load weather for selected city from history."""
@@ -419,85 +756,98 @@ class WeatherApp:
         self.loading.visible = True
         self.error_message.visible = False
         self.weather_container.visible = False
-        self.page.update()
+        self.updates.request()
         
         try:
-            # Use IP-based geolocation service
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get("https://ipapi.co/json/")
-                data = response.json()
-                lat, lon = data['latitude'], data['longitude']
-                
-                # Fetch weather by coordinates
-                weather = await self.weather_service.get_weather_by_coordinates(
-                    lat, lon
-                )
-                self.display_weather(weather)
+            # Cached IP-based location (resolved at startup)
+            location = await self.geolocator.locate(self.weather_service.open())
+            
+            # Fetch weather by coordinates (usually already cached)
+            weather = await self.weather_service.get_weather_by_coordinates(
+                location.lat, location.lon
+            )
+            self.display_weather(weather)
         except Exception as e:
             self.show_error("Could not get your location")
         finally:
             self.loading.visible = False
-            self.page.update()
+            self.updates.request()
     
     def load_watchlist(self):
         """Load watchlist from file."""
-        try:
-            if os.path.exists(self.watchlist_file):
-                with open(self.watchlist_file, 'r') as f:
-                    self.watchlist = json.load(f)
-        except Exception as e:
-            print(f"Error loading watchlist: {e}")
-            self.watchlist = []
+        self.watchlist = self.watchlist_store.load()
     
     def save_watchlist(self):
-        """Save watchlist to file."""
-        try:
-            with open(self.watchlist_file, 'w') as f:
-                json.dump(self.watchlist, f)
-        except Exception as e:
-            print(f"Error saving watchlist: {e}")
+        """Queue a debounced background save of the watchlist."""
+        self.page.run_task(self.watchlist_store.save, list(self.watchlist))
     
     def add_to_watchlist(self, city: str):
         """Add city to watchlist."""
-        if city and city not in self.watchlist:
+        if city and city not in self.watchlist_rows:
             self.watchlist.append(city)
             self.save_watchlist()
-            self.update_watchlist_ui()
+            self.add_watchlist_row(city)
+            # Compare Cities and the refresh scheduler look up the name as
+            # stored, so warm that key rather than the canonical query
+            self.page.run_task(self.request_prefetch, [city])
             return True
         return False
     
     def remove_from_watchlist(self, city: str):
         """Remove city from watchlist."""
-        if city in self.watchlist:
+        if city in self.watchlist_rows:
             self.watchlist.remove(city)
             self.save_watchlist()
-            self.update_watchlist_ui()
+            self.remove_watchlist_row(city)
+    
+    def create_watchlist_row(self, city: str):
+        """Create the row shown for one watchlist city."""
+        return ft.Row(
+            [
+                ft.Text(city, size=16, expand=True),
+                ft.IconButton(
+                    icon=ft.Icons.DELETE,
+                    icon_color=ft.Colors.RED_700,
+                    on_click=lambda e, c=city: self.remove_from_watchlist(c),
+                ),
+            ],
+            spacing=10,
+            key=city,
+        )
+    
+    def add_watchlist_row(self, city: str):
+        """Append one city's row without touching the others."""
+        row = self.watchlist_rows[city] = self.create_watchlist_row(city)
+        if self.watchlist_empty.visible:
+            self.watchlist_empty.visible = False
+        self.watchlist_list.controls.append(row)
+        self.updates.request(self.watchlist_list)
+    
+    def remove_watchlist_row(self, city: str):
+        """Remove one city's row without touching the others."""
+        row = self.watchlist_rows.pop(city)
+        self.watchlist_list.controls.remove(row)
+        if not self.watchlist_rows:
+            self.watchlist_empty.visible = True
+        self.updates.request(self.watchlist_list)
     
     def update_watchlist_ui(self):
-        """Update watchlist display."""
-        self.watchlist_column.controls.clear()
+        """
+        Reconcile the watchlist rows with self.watchlist.
         
-        if not self.watchlist:
-            self.watchlist_column.controls.append(
-                ft.Text("No cities in watchlist", color=ft.Colors.GREY_600)
-            )
-        else:
-            for city in self.watchlist:
-                self.watchlist_column.controls.append(
-                    ft.Row(
-                        [
-                            ft.Text(city, size=16, expand=True),
-                            ft.IconButton(
-                                icon=ft.Icons.DELETE,
-                                icon_color=ft.Colors.RED_700,
-                                on_click=lambda e, c=city: self.remove_from_watchlist(c),
-                            ),
-                        ],
-                        spacing=10,
-                    )
-                )
+        Rows are kept by city, so only cities that were added or removed
+        produce new or deleted controls; existing rows are reused as-is.
+        """
+        rows = {}
+        for city in self.watchlist:
+            row = self.watchlist_rows.get(city)
+            rows[city] = row if row is not None else self.create_watchlist_row(city)
+        self.watchlist_rows = rows
         
-        self.page.update()
+        self.watchlist_empty.visible = not rows
+        self.watchlist_list.controls = [self.watchlist_empty, *rows.values()]
+        if self.watchlist_list.page is not None:
+            self.updates.request(self.watchlist_list)
     
     async def display_watchlist_weather(self):
         """Fetch and display weather for all cities in watchlist."""
@@ -507,46 +857,19 @@ class WeatherApp:
         
         self.loading.visible = True
         self.error_message.visible = False
-        self.page.update()
+        self.updates.request()
         
         try:
-            comparison_cards = []
-            
-            for city in self.watchlist:
-                try:
-                    weather_data = await self.weather_service.get_weather(city)
-                    comparison_cards.append(self.create_comparison_card(weather_data))
-                except Exception as e:
-                    comparison_cards.append(
-                        ft.Container(
-                            content=ft.Text(f"Error loading {city}", color=ft.Colors.RED_700),
-                            bgcolor=ft.Colors.RED_50,
-                            border_radius=10,
-                            padding=15,
-                        )
-                    )
-            
-            # Display comparison
-            self.weather_container.content = ft.Column(
-                [
-                    ft.Text(
-                        "City Comparison",
-                        size=24,
-                        weight=ft.FontWeight.BOLD,
-                    ),
-                    ft.Row(
-                        comparison_cards,
-                        scroll=ft.ScrollMode.AUTO,
-                        spacing=10,
-                    ),
-                ],
-                spacing=15,
+            # Batch-fetch all cities; results keep watchlist order
+            cities = list(self.watchlist)
+            results = await self.weather_service.get_weather_many(
+                cities, concurrency=Config.WATCHLIST_CONCURRENCY
             )
             
-            self.weather_container.animate_opacity = 300
-            self.weather_container.opacity = 0
-            self.weather_container.visible = True
-            self.page.update()
+            # Watchlist prefetches are keyed by the stored name; credit them
+            for city in cities:
+                self.prefetcher.record_use(city)
+            self.display_comparison(cities, results)
             
             # Fade in
             await self.fade_in_weather()
@@ -556,17 +879,59 @@ class WeatherApp:
         
         finally:
             self.loading.visible = False
-            self.page.update()
+            self.updates.request()
     
-    def create_comparison_card(self, data: dict):
+    @timed("render.display_watchlist_weather")
+    def display_comparison(self, cities: list, results: list):
+        """Display comparison cards for fetched watchlist results."""
+        comparison_cards = []
+        for city, result in zip(cities, results):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                comparison_cards.append(self.create_comparison_card(result))
+            except Exception as e:
+                comparison_cards.append(
+                    ft.Container(
+                        content=ft.Text(f"Error loading {city}", color=ft.Colors.RED_700),
+                        bgcolor=ft.Colors.RED_50,
+                        border_radius=10,
+                        padding=15,
+                    )
+                )
+        
+        # Display comparison
+        self.weather_container.content = ft.Column(
+            [
+                ft.Text(
+                    "City Comparison",
+                    size=24,
+                    weight=ft.FontWeight.BOLD,
+                ),
+                ft.Row(
+                    comparison_cards,
+                    scroll=ft.ScrollMode.AUTO,
+                    spacing=10,
+                ),
+            ],
+            spacing=15,
+        )
+        self.last_view = (self.display_comparison, (cities, results))
+        
+        self.weather_container.animate_opacity = 300
+        self.weather_container.opacity = 0
+        self.weather_container.visible = True
+        self.updates.request()
+    
+    def create_comparison_card(self, snapshot: "WeatherSnapshot"):
         """Create a comparison card for a city."""
-        city_name = data.get("name", "Unknown")
-        country = data.get("sys", {}).get("country", "")
-        temp = data.get("main", {}).get("temp", 0)
-        humidity = data.get("main", {}).get("humidity", 0)
-        description = data.get("weather", [{}])[0].get("description", "").title()
-        icon_code = data.get("weather", [{}])[0].get("icon", "01d")
-        wind_speed = data.get("wind", {}).get("speed", 0)
+        city_name = snapshot.name
+        country = snapshot.country
+        temp = snapshot.temp
+        humidity = snapshot.humidity
+        description = snapshot.description
+        icon_code = snapshot.icon
+        wind_speed = snapshot.wind_speed
         
         return ft.Container(
             content=ft.Column(
@@ -577,12 +942,12 @@ class WeatherApp:
                         weight=ft.FontWeight.BOLD,
                     ),
                     ft.Image(
-                        src=f"https://openweathermap.org/img/wn/{icon_code}@2x.png",
+                        src=self.icon_cache.src(icon_code),
                         width=60,
                         height=60,
                     ),
                     ft.Text(
-                        f"{temp:.1f}°C",
+                        format_temperature(temp, self.unit),
                         size=24,
                         weight=ft.FontWeight.BOLD,
                         color=ft.Colors.BLUE_900,
@@ -590,7 +955,7 @@ class WeatherApp:
                     ft.Text(description, size=12, italic=True),
                     ft.Divider(height=10),
                     ft.Text(f"Humidity: {humidity}%", size=11),
-                    ft.Text(f"Wind: {wind_speed} m/s", size=11),
+                    ft.Text(f"Wind: {format_speed(wind_speed, self.unit)}", size=11),
                 ],
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                 spacing=5,
@@ -607,62 +972,38 @@ class WeatherApp:
             self.show_error("Please enter a city name")
             return
         
+        query = self.resolve_city(city)
+        if query is None:
+            return
+        
         self.loading.visible = True
         self.error_message.visible = False
         self.weather_container.visible = False
-        self.page.update()
+        self.updates.request()
         
         try:
-            forecast_data = await self.weather_service.get_forecast(city)
-            self.display_forecast(forecast_data)
+            self.prefetcher.record_use(query)
+            self.page.run_task(self.warm_cache, self.weather_service.get_weather, query)
+            self.display_forecast(await self.weather_service.get_forecast(query))
         except Exception as e:
             self.show_error(str(e))
         finally:
             self.loading.visible = False
-            self.page.update()
+            self.updates.request()
     
-    def display_forecast(self, data: dict):
+    @timed("render.display_forecast")
+    def display_forecast(self, forecast: "Forecast"):
         """Display 5-day forecast."""
+        from mod6_labs.forecast_aggregation import aggregate_daily  # deferred: imports numpy
+        
         try:
-            forecast_list = data.get("list", [])
-            daily_forecasts = {}
-            
-            # Group forecasts by day
-            for item in forecast_list:
-                date = item.get("dt_txt", "").split()[0]  # Extract date YYYY-MM-DD
-                
-                if date not in daily_forecasts:
-                    daily_forecasts[date] = {
-                        "temps": [],
-                        "descriptions": [],
-                        "icons": [],
-                        "humidity": [],
-                    }
-                
-                daily_forecasts[date]["temps"].append(item.get("main", {}).get("temp", 0))
-                daily_forecasts[date]["descriptions"].append(
-                    item.get("weather", [{}])[0].get("description", "").title()
-                )
-                daily_forecasts[date]["icons"].append(
-                    item.get("weather", [{}])[0].get("icon", "01d")
-                )
-                daily_forecasts[date]["humidity"].append(
-                    item.get("main", {}).get("humidity", 0)
-                )
-            
-            # Create forecast cards
-            forecast_cards = []
-            for i, (date, forecast_data) in enumerate(list(daily_forecasts.items())[:5]):
-                temps = forecast_data["temps"]
-                high_temp = max(temps)
-                low_temp = min(temps)
-                description = forecast_data["descriptions"][0] if forecast_data["descriptions"] else "N/A"
-                icon_code = forecast_data["icons"][0] if forecast_data["icons"] else "01d"
-                avg_humidity = sum(forecast_data["humidity"]) // len(forecast_data["humidity"])
-                
-                forecast_cards.append(
-                    self.create_forecast_card(date, high_temp, low_temp, description, icon_code, avg_humidity)
+            # Daily high/low, mean humidity and dominant condition per local day
+            forecast_cards = [
+                self.create_forecast_card(
+                    day.date, day.high, day.low, day.description, day.icon, day.humidity
                 )
+                for day in aggregate_daily(forecast, days=5)
+            ]
             
             # Display forecast
             self.weather_container.content = ft.Column(
@@ -680,12 +1021,13 @@ class WeatherApp:
                 ],
                 spacing=15,
             )
+            self.last_view = (self.display_forecast, (forecast,))
             
             self.weather_container.animate_opacity = 300
             self.weather_container.opacity = 0
             self.weather_container.visible = True
             self.error_message.visible = False
-            self.page.update()
+            self.updates.request()
             
             # Fade in
             self.page.run_task(self.fade_in_weather)
@@ -707,7 +1049,7 @@ class WeatherApp:
                     ),
                     # Icon
                     ft.Image(
-                        src=f"https://openweathermap.org/img/wn/{icon}@2x.png",
+                        src=self.icon_cache.src(icon),
                         width=50,
                         height=50,
                     ),
@@ -723,13 +1065,13 @@ class WeatherApp:
                     ft.Column(
                         [
                             ft.Text(
-                                f"H: {high:.1f}°C",
+                                f"H: {format_temperature(high, self.unit)}",
                                 size=12,
                                 weight=ft.FontWeight.BOLD,
                                 color=ft.Colors.RED_700,
                             ),
                             ft.Text(
-                                f"L: {low:.1f}°C",
+                                f"L: {format_temperature(low, self.unit)}",
                                 size=12,
                                 weight=ft.FontWeight.BOLD,
                                 color=ft.Colors.BLUE_700,
@@ -754,4 +1096,4 @@ def main(page: ft.Page):
 
 
 if __name__ == "__main__":
-    ft.app(target=main)
\ No newline at end of file
+    ft.app(target=main, assets_dir=Config.ASSETS_DIR)
\ No newline at end of file
@@ -0,0 +1,145 @@
+# prefetch.py
+"""Low-priority speculative prefetching of cities the user is likely to open.
+
+Candidates (recent searches, new watchlist cities, the top autocomplete
+match) are queued and fetched one at a time on the background lane. To
+keep interactive lookups fast and within the API quota, a prefetch only
+starts when no one is waiting on the rate limiter, at least ``reserve``
+tokens would be left after it (one prefetch takes ``cost`` tokens), and
+fewer than ``budget`` prefetches ran in the last ``window`` seconds;
+anything over budget is dropped, not delayed.
+
+``record_use()`` is called when the user actually opens a city, so the
+stats show how many prefetches were used before they expired.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+from mod6_labs.rate_limiter import RateLimiter
+
+
+class Prefetcher:
+    """Budgeted background cache warmer."""
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable],
+        is_cached: Callable[[str], bool],
+        rate_limiter: Optional[RateLimiter] = None,
+        budget: int = 10,
+        window: float = 60.0,
+        reserve: float = 3,
+        cost: int = 1,
+        max_pending: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fetch = fetch
+        self.is_cached = is_cached
+        self.rate_limiter = rate_limiter
+        self.budget = budget
+        self.window = window
+        self.reserve = reserve
+        self.cost = cost
+        self.max_pending = max_pending
+        self._clock = clock
+
+        self._pending: "OrderedDict[str, None]" = OrderedDict()
+        self._started: Deque[float] = deque()
+        self._prefetched: "OrderedDict[str, None]" = OrderedDict()
+        self._worker: Optional[asyncio.Task] = None
+
+        self.requested = 0
+        self.prefetched = 0
+        self.skipped_cached = 0
+        self.dropped = 0
+        self.failed = 0
+        self.hits = 0
+        self.uses = 0
+
+    def request(self, city: Optional[str]) -> None:
+        """Queue a city for prefetching (most recent requests first)."""
+        if not city:
+            return
+        self.requested += 1
+        self._pending.pop(city, None)
+        self._pending[city] = None
+        while len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run())
+
+    def record_use(self, city: str) -> None:
+        """Note that the user opened ``city``; counts a hit if it was prefetched."""
+        self.uses += 1
+        if city in self._prefetched:
+            del self._prefetched[city]
+            if self.is_cached(city):
+                self.hits += 1
+
+    def discard(self, city: str) -> None:
+        """Drop a queued city that is no longer a likely pick."""
+        self._pending.pop(city, None)
+
+    def _over_budget(self) -> bool:
+        now = self._clock()
+        while self._started and now - self._started[0] >= self.window:
+            self._started.popleft()
+        return len(self._started) >= self.budget
+
+    def _limiter_busy(self) -> bool:
+        limiter = self.rate_limiter
+        return limiter is not None and (
+            limiter.queue_depth() > 0 or limiter.tokens < self.reserve + self.cost
+        )
+
+    async def _run(self) -> None:
+        while self._pending:
+            if self._over_budget():
+                self.dropped += len(self._pending)
+                self._pending.clear()
+                return
+            if self._limiter_busy():
+                await asyncio.sleep(1.0)
+                continue
+
+            city, _ = self._pending.popitem(last=True)
+            if self.is_cached(city):
+                self.skipped_cached += 1
+                continue
+
+            self._started.append(self._clock())
+            try:
+                await self.fetch(city)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failed += 1
+                continue
+            self.prefetched += 1
+            self._prefetched[city] = None
+            while len(self._prefetched) > self.max_pending * 5:
+                self._prefetched.popitem(last=False)
+
+    def cancel(self) -> None:
+        """Stop prefetching and forget queued cities."""
+        self._pending.clear()
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def stats(self) -> Dict[str, float]:
+        """Return prefetch counts and how often prefetched cities were used."""
+        return {
+            "requested": self.requested,
+            "prefetched": self.prefetched,
+            "skipped_cached": self.skipped_cached,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "uses": self.uses,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.prefetched if self.prefetched else 0.0,
+        }
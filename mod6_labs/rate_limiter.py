@@ -0,0 +1,196 @@
+# rate_limiter.py
+"""Client-side token-bucket rate limiter with priority lanes."""
+
+import asyncio
+import heapq
+import itertools
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class Priority:
+    """Request lanes; lower values are served first."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+    NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+
+class RateLimiter:
+    """Token bucket that queues callers instead of failing them.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    When the bucket is empty, callers wait in a priority queue: every
+    interactive waiter is served before any background waiter, and each
+    lane is first-in, first-out. ``promote()`` moves a task's queued and
+    later requests into a higher lane, e.g. when an interactive caller
+    starts waiting on a request that background work started.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+
+        # (lane, arrival order, future, owning task); the future's result is
+        # the lane it was finally served from
+        self._waiters: List[Tuple[int, int, asyncio.Future, Optional[asyncio.Task]]] = []
+        self._sequence = itertools.count()
+        self._dispatcher = None
+        self._promoted: "weakref.WeakKeyDictionary[asyncio.Task, int]" = weakref.WeakKeyDictionary()
+
+        # Metrics per lane
+        self.acquired = {lane: 0 for lane in Priority.NAMES}
+        self.queued = {lane: 0 for lane in Priority.NAMES}
+        self.total_wait = {lane: 0.0 for lane in Priority.NAMES}
+        self.max_wait = {lane: 0.0 for lane in Priority.NAMES}
+        self.promotions = 0
+
+    @classmethod
+    def per_period(cls, calls: int, period: float, burst: int) -> "RateLimiter":
+        """Build a limiter allowing ``calls`` per ``period`` seconds."""
+        return cls(rate=calls / period, capacity=burst)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def queue_depth(self, priority: Optional[int] = None) -> int:
+        """Number of callers waiting (in one lane, or in total)."""
+        return sum(
+            1 for lane, _, future, _ in self._waiters
+            if not future.done() and (priority is None or lane == priority)
+        )
+
+    def try_acquire(self, priority: int = Priority.BACKGROUND) -> bool:
+        """Take a token only if one is free right now and nobody is queued."""
+        self._refill()
+        if self._waiters or self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self._record(priority, 0.0)
+        return True
+
+    async def acquire(
+        self,
+        priority: int = Priority.INTERACTIVE,
+        timeout: Optional[float] = None,
+    ) -> float:
+        """
+        Take one token, waiting in the priority queue if none is available.
+
+        Args:
+            priority: Priority.INTERACTIVE or Priority.BACKGROUND; a task
+                that was promoted uses its promoted lane if higher
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            asyncio.TimeoutError: If no token was granted within ``timeout``
+        """
+        task = asyncio.current_task()
+        if task is not None:
+            priority = min(priority, self._promoted.get(task, priority))
+
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self._record(priority, 0.0)
+            return 0.0
+        if timeout is not None and timeout <= 0:
+            raise asyncio.TimeoutError()
+
+        start = self._clock()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future, task))
+        self.queued[priority] += 1
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+        # Waiting on the future itself keeps current_task() stable for promote()
+        lane = await asyncio.wait_for(future, timeout)
+        waited = self._clock() - start
+        self._record(lane, waited)
+        return waited
+
+    def promote(self, task: asyncio.Task, priority: int) -> bool:
+        """
+        Serve ``task``'s current and future requests from ``priority`` or higher.
+
+        Tokens the task is already queued for keep their arrival order
+        within the new lane.
+
+        Args:
+            task: Task whose requests should be promoted
+            priority: Lane to move them to
+
+        Returns:
+            True if a queued request was moved to a higher lane
+        """
+        if priority >= self._promoted.get(task, max(Priority.NAMES)):
+            return False
+        self._promoted[task] = priority
+
+        moved = False
+        for i, (lane, sequence, future, owner) in enumerate(self._waiters):
+            if owner is task and lane > priority and not future.done():
+                self._waiters[i] = (priority, sequence, future, owner)
+                moved = True
+        if moved:
+            heapq.heapify(self._waiters)
+            self.promotions += 1
+        return moved
+
+    def _record(self, priority: int, waited: float) -> None:
+        self.acquired[priority] += 1
+        self.total_wait[priority] += waited
+        self.max_wait[priority] = max(self.max_wait[priority], waited)
+
+    async def _dispatch(self) -> None:
+        """Hand out tokens to queued callers as they refill."""
+        while self._waiters:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+
+            lane, _, future, _ = heapq.heappop(self._waiters)
+            if future.done():  # Caller was cancelled while queued
+                continue
+            self._tokens -= 1
+            future.set_result(lane)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and wait-time metrics per lane."""
+        stats = {"tokens": round(self.tokens, 2), "promotions": self.promotions}
+        for lane, name in Priority.NAMES.items():
+            acquired = self.acquired[lane]
+            stats[name] = {
+                "queue_depth": self.queue_depth(lane),
+                "acquired": acquired,
+                "queued": self.queued[lane],
+                "mean_wait": self.total_wait[lane] / acquired if acquired else 0.0,
+                "max_wait": self.max_wait[lane],
+            }
+        return stats
@@ -0,0 +1,70 @@
+# resilience.py
+"""Latency tracking and retry helpers for hedged, deadline-bound requests."""
+
+import random
+from collections import deque
+from typing import Deque, Dict, Optional
+
+# Upstream statuses worth retrying for an idempotent GET
+RETRYABLE_STATUS = {502, 503, 504}
+
+
+class LatencyWindow:
+    """Sliding window of recent request latencies per endpoint.
+
+    Used to derive the hedging delay: a duplicate request is only sent once
+    the first one is slower than the recent ``quantile`` (e.g. p95).
+    """
+
+    def __init__(
+        self,
+        size: int = 100,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        default_delay: float = 1.0,
+    ):
+        self.size = size
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.default_delay = default_delay
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        """Add one successful request latency."""
+        window = self._samples.get(endpoint)
+        if window is None:
+            window = self._samples[endpoint] = deque(maxlen=self.size)
+        window.append(seconds)
+
+    def percentile(self, endpoint: str, quantile: Optional[float] = None) -> Optional[float]:
+        """Return a latency percentile, or None without enough samples."""
+        window = self._samples.get(endpoint)
+        if not window or len(window) < self.min_samples:
+            return None
+        ordered = sorted(window)
+        q = self.quantile if quantile is None else quantile
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def hedge_delay(self, endpoint: str) -> float:
+        """Seconds to wait before sending a hedged duplicate request."""
+        value = self.percentile(endpoint)
+        if value is None:
+            return self.default_delay
+        return max(self.min_delay, value)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Exponential back-off with full jitter.
+
+    Args:
+        attempt: Retry number, starting at 1
+        base: Delay before the first retry
+        cap: Maximum delay
+
+    Returns:
+        Seconds to sleep before the retry
+    """
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
@@ -0,0 +1,104 @@
+# scheduler.py
+"""Background refresh scheduler with jitter and adaptive back-off."""
+
+import asyncio
+import random
+from typing import Awaitable, Callable, Optional
+
+
+class RefreshScheduler:
+    """Run a refresh coroutine periodically until stopped.
+
+    Each delay is ``interval`` with +/- ``jitter`` (a fraction) applied so
+    several clients do not hit the API in lockstep. After a failure the
+    delay doubles for every consecutive error, up to ``max_interval``; an
+    error's ``retry_after`` (see RateLimitError) is honoured when longer. The
+    scheduler can be paused (e.g. while the window is hidden) and resumed;
+    resuming after a long pause refreshes right away.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[], Awaitable[None]],
+        interval: float,
+        jitter: float = 0.1,
+        max_interval: Optional[float] = None,
+    ):
+        self.refresh = refresh
+        self.interval = interval
+        self.jitter = jitter
+        self.max_interval = max_interval if max_interval is not None else interval * 8
+
+        self.failures = 0
+        self.runs = 0
+        self.next_delay = interval
+
+        self._running = asyncio.Event()
+        self._running.set()
+        self._wake = asyncio.Event()
+        self._stopped = False
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def pause(self) -> None:
+        """Stop refreshing until ``resume()`` is called."""
+        self._running.clear()
+
+    def resume(self) -> None:
+        """Continue refreshing, starting with an immediate refresh."""
+        if self.paused:
+            self._running.set()
+            self._wake.set()
+
+    def stop(self) -> None:
+        """End the run loop."""
+        self._stopped = True
+        self._running.set()
+        self._wake.set()
+
+    def compute_delay(self, error: Optional[Exception] = None) -> float:
+        """
+        Compute the wait before the next refresh.
+
+        Args:
+            error: Exception raised by the last refresh, if any
+
+        Returns:
+            Delay in seconds
+        """
+        if error is None:
+            base = self.interval
+        else:
+            base = min(self.interval * (2 ** self.failures), self.max_interval)
+            retry_after = getattr(error, "retry_after", None)
+            if retry_after:
+                base = max(base, retry_after)
+
+        return max(0.0, base * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    async def run(self) -> None:
+        """Refresh, wait, and repeat until ``stop()`` is called."""
+        while not self._stopped:
+            await self._running.wait()
+            if self._stopped:
+                break
+
+            error = None
+            try:
+                await self.refresh()
+                self.failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+                self.failures += 1
+            self.runs += 1
+
+            self.next_delay = self.compute_delay(error)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.next_delay)
+            except asyncio.TimeoutError:
+                pass
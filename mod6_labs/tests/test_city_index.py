@@ -0,0 +1,53 @@
+# test_city_index.py
+"""Tests for the offline city index."""
+
+import json
+
+import pytest
+
+from mod6_labs.city_index import CityIndex, build_index
+
+CITIES = [
+    {"id": 1, "name": "Portland", "country": "US"},
+    {"id": 2, "name": "Portland", "country": "AU"},
+    {"id": 3, "name": "São Paulo", "country": "BR"},
+    {"id": 4, "name": "Porto", "country": "PT"},
+    {"id": 5, "name": "Manila", "country": "PH"},
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    source = tmp_path / "city.list.json"
+    source.write_text(json.dumps(CITIES), encoding="utf-8")
+    destination = tmp_path / "index" / "cities.tsv.gz"
+    assert build_index(str(source), str(destination)) == len(CITIES)
+    return CityIndex(str(destination))
+
+
+def test_suggest_folds_accents_and_case(index):
+    assert [r.id for r in index.suggest("sao p")] == [3]
+    assert [r.label for r in index.suggest("PORT")] == ["Portland, AU", "Portland, US", "Porto, PT"]
+    assert index.suggest("   ") == []
+
+
+def test_matches_narrows_by_country_code(index):
+    assert {r.id for r in index.matches("portland")} == {1, 2}
+    assert [r.id for r in index.matches("Portland, us")] == [1]
+
+
+def test_matches_ignores_a_state_before_the_country(index):
+    assert [r.id for r in index.matches("Portland,OR,US")] == [1]
+    assert index.matches("Portland,OR,GB") == []
+
+
+def test_resolve_only_returns_unambiguous_names(index):
+    assert index.resolve("Portland") is None
+    assert index.resolve("Manila").query == "Manila,PH"
+    assert index.resolve("Atlantis") is None
+
+
+def test_missing_index_file_is_empty(tmp_path):
+    index = CityIndex(str(tmp_path / "missing.tsv.gz"))
+    assert len(index) == 0
+    assert index.suggest("Man") == []
@@ -0,0 +1,53 @@
+# test_disk_cache.py
+"""Tests for the persistent SQLite response store."""
+
+import pytest
+
+from mod6_labs.disk_cache import DiskCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    store = DiskCache(str(tmp_path / "cache" / "weather.db"), max_entries=3, max_stale=60)
+    yield store
+    store.close()
+
+
+def test_stale_entries_are_served_until_their_hard_expiry(cache):
+    cache.set(("weather", "fresh"), {"temp": 1}, ttl=600)
+    cache.set(("weather", "stale"), {"temp": 2}, ttl=-10)  # 10 s past its TTL
+    cache.set(("weather", "expired"), {"temp": 3}, ttl=-70)  # past TTL + max_stale
+
+    assert cache.get(("weather", "fresh"))[:2] == ({"temp": 1}, True)
+    assert cache.get(("weather", "stale"))[:2] == ({"temp": 2}, False)
+    assert cache.get(("weather", "expired")) is None
+    assert (cache.fresh_hits, cache.stale_hits, cache.misses) == (1, 1, 1)
+    assert len(cache) == 2  # the hard-expired row was dropped
+
+
+def test_flush_enforces_the_size_cap_by_last_access(cache):
+    for city in ("a", "b", "c"):
+        cache.set(("weather", city), city, ttl=600)
+    cache.flush()
+    cache.get(("weather", "a"))  # a is now more recent than b and c
+
+    cache.set(("weather", "d"), "d", ttl=600)
+    assert len(cache) == 4  # the cap is only applied on flush
+    cache.flush()
+
+    assert len(cache) == 3
+    assert cache.get(("weather", "b")) is None
+    assert cache.get(("weather", "a"))[0] == "a"
+
+
+def test_entries_survive_a_reopen_after_close(tmp_path):
+    path = str(tmp_path / "weather.db")
+    store = DiskCache(path)
+    store.set(("forecast", "Manila"), [1, 2, 3], ttl=600)
+    store.close()
+
+    reopened = DiskCache(path)
+    try:
+        assert reopened.get(("forecast", "Manila"))[:2] == ([1, 2, 3], True)
+    finally:
+        reopened.close()
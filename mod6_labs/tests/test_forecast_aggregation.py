@@ -0,0 +1,67 @@
+# test_forecast_aggregation.py
+"""Tests for the vectorized daily forecast aggregation."""
+
+from datetime import datetime, timezone
+
+from mod6_labs.forecast_aggregation import aggregate_daily, aggregate_many
+
+
+def slot(when: str, temp: float, humidity: int = 50, condition: int = 800, icon: str = "01d"):
+    """One /forecast list item at ``when`` (UTC, ISO format)."""
+    dt = int(datetime.fromisoformat(when).replace(tzinfo=timezone.utc).timestamp())
+    return {
+        "dt": dt,
+        "main": {"temp": temp, "humidity": humidity},
+        "weather": [{"id": condition, "description": "clear sky", "icon": icon}],
+    }
+
+
+def response(slots, tz: int = 0):
+    return {"list": slots, "city": {"id": 1, "name": "Test", "timezone": tz}}
+
+
+def test_slots_are_grouped_by_local_day():
+    # 12:00 and 18:00 UTC fall on the same UTC day but on different days at UTC+9
+    slots = [
+        slot("2024-01-01T12:00:00", 10, humidity=40),
+        slot("2024-01-01T18:00:00", 4, humidity=60),
+        slot("2024-01-01T21:00:00", 6, humidity=80),
+    ]
+
+    utc = aggregate_daily(response(slots))
+    tokyo = aggregate_daily(response(slots, tz=9 * 3600))
+
+    assert [(d.date, d.high, d.low) for d in utc] == [("2024-01-01", 10, 4)]
+    assert [(d.date, d.high, d.low, d.humidity) for d in tokyo] == [
+        ("2024-01-01", 10, 10, 40),
+        ("2024-01-02", 6, 4, 70),
+    ]
+
+
+def test_dominant_condition_and_its_first_icon():
+    slots = [
+        slot("2024-01-01T00:00:00", 5, condition=800, icon="01n"),
+        slot("2024-01-01T03:00:00", 5, condition=500, icon="10n"),
+        slot("2024-01-01T06:00:00", 5, condition=500, icon="10d"),
+    ]
+    slots[1]["weather"][0]["description"] = "light rain"
+    slots[2]["weather"][0]["description"] = "light rain"
+
+    (day,) = aggregate_daily(response(slots))
+    assert (day.description, day.icon) == ("Light Rain", "10n")
+
+
+def test_days_limits_the_result():
+    slots = [slot(f"2024-01-0{d}T12:00:00", d) for d in range(1, 8)]
+    assert len(aggregate_daily(response(slots), days=5)) == 5
+
+
+def test_aggregate_many_keeps_input_order_with_empty_cities():
+    first = response([slot("2024-01-01T12:00:00", 1)])
+    last = response([slot("2024-01-01T12:00:00", 3), slot("2024-01-02T12:00:00", 7)])
+
+    results = aggregate_many([first, response([]), last])
+
+    assert [len(daily) for daily in results] == [1, 0, 2]
+    assert results[0][0].high == 1
+    assert [d.high for d in results[2]] == [3, 7]
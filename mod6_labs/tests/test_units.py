@@ -0,0 +1,44 @@
+# test_units.py
+"""Tests for the metric-to-display unit conversions."""
+
+import pytest
+
+from mod6_labs.units import (
+    convert_speed,
+    convert_temperature,
+    format_speed,
+    format_temperature,
+    next_unit,
+    normalize_unit,
+)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("c", "C"), (" f ", "F"), ("K", "K"), ("metric", "C"), ("", "C"), (None, "C")],
+)
+def test_normalize_unit(value, expected):
+    assert normalize_unit(value) == expected
+
+
+def test_normalize_unit_uses_the_given_default():
+    assert normalize_unit("rankine", default="F") == "F"
+
+
+def test_conversions_from_metric():
+    assert convert_temperature(100, "F") == pytest.approx(212)
+    assert convert_temperature(0, "K") == pytest.approx(273.15)
+    assert convert_temperature(21.5, "C") == 21.5
+    assert convert_speed(10, "F") == pytest.approx(22.369, abs=1e-3)
+    assert convert_speed(10, "K") == 10
+
+
+def test_formatting_pairs_wind_units_with_temperature_units():
+    assert format_temperature(22, "F") == "71.6°F"
+    assert format_temperature(22, "K") == "295.1K"
+    assert format_speed(3, "C") == "3.0 m/s"
+    assert format_speed(3, "F") == "6.7 mph"
+
+
+def test_next_unit_cycles_through_all_units():
+    assert [next_unit(u) for u in ("C", "F", "K")] == ["F", "K", "C"]
@@ -0,0 +1,48 @@
+# test_watchlist_store.py
+"""Tests for the debounced watchlist writer."""
+
+import asyncio
+
+from mod6_labs.watchlist_store import WatchlistStore
+
+
+def test_edits_inside_the_window_cost_one_write(tmp_path):
+    path = tmp_path / "data" / "watchlist.json"
+
+    async def scenario():
+        store = WatchlistStore(str(path), delay=0.05)
+        await store.save(["Manila"])
+        await store.save(["Manila", "Cebu"])
+        await store.save(["Cebu"])
+        await asyncio.sleep(0.2)
+        return store
+
+    store = asyncio.run(scenario())
+    assert (store.saves_requested, store.writes) == (3, 1)
+    assert WatchlistStore(str(path)).load() == ["Cebu"]
+    assert not (tmp_path / "data" / "watchlist.json.tmp").exists()
+
+
+def test_flush_writes_without_waiting_for_the_delay(tmp_path):
+    path = tmp_path / "watchlist.json"
+
+    async def scenario():
+        store = WatchlistStore(str(path), delay=60)
+        await store.save(["Davao"])
+        await asyncio.wait_for(store.flush(), timeout=1)
+        return store
+
+    store = asyncio.run(scenario())
+    assert store.writes == 1
+    assert WatchlistStore(str(path)).load() == ["Davao"]
+
+
+def test_load_ignores_missing_or_invalid_files(tmp_path):
+    path = tmp_path / "watchlist.json"
+    assert WatchlistStore(str(path)).load() == []
+
+    path.write_text('["Iloilo", 3, null]', encoding="utf-8")
+    assert WatchlistStore(str(path)).load() == ["Iloilo"]
+
+    path.write_text("{not json", encoding="utf-8")
+    assert WatchlistStore(str(path)).load() == []
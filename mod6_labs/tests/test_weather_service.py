@@ -0,0 +1,214 @@
+# test_weather_service.py
+"""WeatherService tests against the in-process mock OpenWeather server.
+
+Run from the repository root::
+
+    python -m pytest mod6_labs/tests
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from mod6_labs.benchmarks.mock_server import MockServer
+from mod6_labs.cache import TTLCache
+from mod6_labs.config import Config
+from mod6_labs.rate_limiter import Priority, RateLimiter
+from mod6_labs.resilience import LatencyWindow
+from mod6_labs.weather_service import WeatherService, WeatherServiceError
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Mock API on a free port, with Config pointed at it."""
+    with MockServer() as mock:
+        monkeypatch.setattr(Config, "API_KEY", "test")
+        monkeypatch.setattr(Config, "BASE_URL", f"{mock.base}/weather")
+        monkeypatch.setattr(Config, "FORECAST_URL", f"{mock.base}/forecast")
+        monkeypatch.setattr(Config, "GROUP_URL", f"{mock.base}/group")
+        yield mock
+
+
+def make_service(**kwargs) -> WeatherService:
+    kwargs.setdefault("rate_limiter", RateLimiter(1000, 1000))
+    kwargs.setdefault("hedge", False)
+    return WeatherService(**kwargs)
+
+
+def test_interactive_caller_promotes_joined_background_request(server):
+    async def scenario():
+        service = make_service(rate_limiter=RateLimiter(5, 1))
+        async with service:
+            background = asyncio.ensure_future(
+                service.get_weather_many([f"City{i}" for i in range(8)])
+            )
+            await asyncio.sleep(0.05)
+
+            # City7 is queued last in the background lane; joining it from
+            # the interactive lane must not wait behind City1..City6
+            start = time.perf_counter()
+            snapshot = await service.get_weather("City7")
+            elapsed = time.perf_counter() - start
+            await background
+        return snapshot, elapsed, service
+
+    snapshot, elapsed, service = asyncio.run(scenario())
+    assert snapshot.name == "City7"
+    assert elapsed < 0.6
+    assert service.coalesced_requests == 1
+    assert service.rate_limiter.promotions == 1
+    assert server.settings.requests == 8
+
+
+def test_get_weather_many_learns_ids_then_batches_through_group(server, monkeypatch):
+    monkeypatch.setattr(Config, "GROUP_MAX_IDS", 3)
+    cities = [f"Watch{i}" for i in range(7)]
+
+    async def scenario():
+        service = make_service()
+        async with service:
+            first = await service.get_weather_many(cities)
+            learned = server.settings.requests
+            service.cache.clear()
+            second = await service.get_weather_many(cities)
+        return first, learned, second
+
+    first, learned, second = asyncio.run(scenario())
+    assert [snapshot.name for snapshot in first] == cities
+    assert learned == 7  # one /weather call per city teaches its ID
+    # Same cities and readings (dt is the mock's wall clock, so not compared)
+    assert [(s.city_id, s.temp) for s in second] == [(s.city_id, s.temp) for s in first]
+    assert server.settings.requests == 7 + 3  # then ceil(7 / 3) /group calls
+
+
+def test_get_weather_many_mixes_group_and_individual_lookups(server):
+    async def scenario():
+        service = make_service()
+        async with service:
+            await service.get_weather_many(["Known0", "Known1", "Known2"])
+            service.cache.clear()
+            before = server.settings.requests
+            results = await service.get_weather_many(["Known0", "New0", "Known1", "New1", "Known2"])
+        return before, results
+
+    before, results = asyncio.run(scenario())
+    assert [snapshot.name for snapshot in results] == ["Known0", "New0", "Known1", "New1", "Known2"]
+    assert server.settings.requests - before == 1 + 2  # one /group, two /weather
+
+
+def test_failed_group_call_falls_back_to_individual_requests(server):
+    async def scenario():
+        service = make_service(max_retries=0)
+        async with service:
+            await service.get_weather_many(["Fail0", "Fail1"])
+            service.cache.clear()
+            server.settings.error_rate = 1.0
+            server.settings.error_status = 500
+            before = server.settings.requests
+            results = await service.get_weather_many(["Fail0", "Fail1"])
+        return before, results
+
+    before, results = asyncio.run(scenario())
+    assert all(isinstance(result, WeatherServiceError) for result in results)
+    assert server.settings.requests - before == 1 + 2  # failed /group, then each city
+
+
+def test_concurrent_identical_lookups_share_one_request(server):
+    server.settings.latency = 0.1
+
+    async def scenario():
+        service = make_service()
+        async with service:
+            results = await asyncio.gather(*(service.get_weather("Shared") for _ in range(5)))
+        return service, results
+
+    service, results = asyncio.run(scenario())
+    assert all(result == results[0] for result in results)
+    assert service.coalesced_requests == 4
+    assert server.settings.requests == 1
+
+
+def test_refresh_ahead_rerequests_entries_expiring_before_next_run(server):
+    now = [0.0]
+    cities = ["Refresh0", "Refresh1"]
+
+    async def scenario():
+        service = make_service(cache=TTLCache(default_ttl=600, clock=lambda: now[0]))
+        async with service:
+            await service.get_weather_many(cities, refresh_ahead=330)
+            counts = [server.settings.requests]
+            for at in (300, 310, 620):
+                now[0] = at
+                await service.get_weather_many(cities, refresh_ahead=330)
+                counts.append(server.settings.requests)
+            fresh = all(service.is_fresh("weather", city) for city in cities)
+        return counts, fresh
+
+    counts, fresh = asyncio.run(scenario())
+    # Learn IDs at t=0; at 300 s both expire within 330 s -> one /group call;
+    # at 310 s they are good until 900 s; at 620 s they are due again
+    assert counts == [2, 3, 3, 4]
+    assert fresh
+
+
+def test_retryable_errors_are_retried_up_to_the_limit(server, monkeypatch):
+    monkeypatch.setattr(Config, "RETRY_BACKOFF", 0.01)
+    server.settings.error_rate = 1.0
+    server.settings.error_status = 503
+
+    async def scenario():
+        service = make_service(max_retries=2)
+        async with service:
+            with pytest.raises(WeatherServiceError):
+                await service.get_weather("Flaky")
+        return service
+
+    service = asyncio.run(scenario())
+    assert service.retries == 2
+    assert server.settings.requests == 3
+
+
+def test_deadline_bounds_a_slow_request(server):
+    server.settings.latency = 0.5
+
+    async def scenario():
+        service = make_service(deadline=0.2)
+        async with service:
+            start = time.perf_counter()
+            with pytest.raises(WeatherServiceError, match="timed out"):
+                await service.get_weather("Slow")
+            return service, time.perf_counter() - start
+
+    service, elapsed = asyncio.run(scenario())
+    assert elapsed < 0.45
+    assert service.deadlines_exceeded == 1
+
+
+def test_deadline_bounds_the_wait_for_rate_limit_quota(server):
+    async def scenario():
+        service = make_service(rate_limiter=RateLimiter(0.5, 1), deadline=0.3)
+        async with service:
+            await service.get_weather("First")
+            with pytest.raises(WeatherServiceError, match="timed out"):
+                await service.get_weather("Second", priority=Priority.INTERACTIVE)
+        return service
+
+    service = asyncio.run(scenario())
+    assert service.deadlines_exceeded == 1
+    assert server.settings.requests == 1  # no attempt once the deadline passed
+
+
+def test_slow_request_is_hedged(server):
+    server.settings.latency = 0.2
+
+    async def scenario():
+        service = make_service(hedge=True)
+        service.latency = LatencyWindow(min_delay=0.01, default_delay=0.05)
+        async with service:
+            snapshot = await service.get_weather("Hedged")
+        return service, snapshot
+
+    service, snapshot = asyncio.run(scenario())
+    assert snapshot.name == "Hedged"
+    assert service.hedges_sent == 1
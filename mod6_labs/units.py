@@ -0,0 +1,63 @@
+# units.py
+"""Local conversion from the canonical (metric) units to display units.
+
+WeatherService always fetches and caches metric data (°C, m/s); the UI
+converts at render time, so switching units needs no request and the
+cache holds one entry per city instead of one per unit system.
+"""
+
+# Display temperature unit -> (symbol, wind speed unit)
+TEMPERATURE_UNITS = {
+    "C": ("°C", "m/s"),
+    "F": ("°F", "mph"),
+    "K": ("K", "m/s"),
+}
+
+MPH_PER_MPS = 2.2369362920544
+
+
+def normalize_unit(unit: str, default: str = "C") -> str:
+    """Upper-case a unit name, falling back to ``default`` if it is unknown."""
+    unit = (unit or "").strip().upper()
+    return unit if unit in TEMPERATURE_UNITS else default
+
+
+def convert_temperature(celsius: float, unit: str) -> float:
+    """
+    Convert a temperature from °C.
+
+    Args:
+        celsius: Temperature in °C
+        unit: "C", "F" or "K"
+
+    Returns:
+        Temperature in the requested unit
+    """
+    if unit == "F":
+        return celsius * 9 / 5 + 32
+    if unit == "K":
+        return celsius + 273.15
+    return celsius
+
+
+def convert_speed(mps: float, unit: str) -> float:
+    """Convert a wind speed from m/s to the wind unit paired with ``unit``."""
+    if TEMPERATURE_UNITS[unit][1] == "mph":
+        return mps * MPH_PER_MPS
+    return mps
+
+
+def format_temperature(celsius: float, unit: str) -> str:
+    """Format a °C value for display in ``unit``, e.g. ``"71.6°F"``."""
+    return f"{convert_temperature(celsius, unit):.1f}{TEMPERATURE_UNITS[unit][0]}"
+
+
+def format_speed(mps: float, unit: str) -> str:
+    """Format an m/s wind speed for display alongside ``unit`` temperatures."""
+    return f"{convert_speed(mps, unit):.1f} {TEMPERATURE_UNITS[unit][1]}"
+
+
+def next_unit(unit: str) -> str:
+    """Return the unit after ``unit`` in the °C -> °F -> K toggle cycle."""
+    units = list(TEMPERATURE_UNITS)
+    return units[(units.index(unit) + 1) % len(units)]
@@ -0,0 +1,98 @@
+# update_batcher.py
+"""Coalesce Flet ``page.update()`` calls into one flush per loop tick.
+
+Handlers mark the page (or a few controls) dirty with ``request()``; the
+actual update is sent once, on the next event-loop iteration (or after
+``delay`` seconds, e.g. one frame), no matter how many times it was
+requested in between. ``request()`` is safe to call from the event loop
+and from the worker threads Flet runs synchronous handlers in.
+"""
+
+import threading
+import weakref
+from typing import Dict, List
+
+
+class UpdateBatcher:
+    """Batch page updates for one Flet page."""
+
+    _pages: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def __init__(self, page, delay: float = 0.0):
+        # Weak so the per-page registry does not keep closed sessions alive
+        self._page = weakref.ref(page)
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._full = False
+        self._controls: List = []
+
+        self.requested = 0
+        self.flushed = 0
+
+    @property
+    def page(self):
+        return self._page()
+
+    @classmethod
+    def for_page(cls, page) -> "UpdateBatcher":
+        """Return the page's batcher, creating it on first use."""
+        batcher = cls._pages.get(page)
+        if batcher is None:
+            batcher = cls._pages[page] = cls(page)
+        return batcher
+
+    def request(self, *controls) -> None:
+        """
+        Mark the page dirty and schedule a flush if none is pending.
+
+        Args:
+            *controls: Controls to update; none means the whole page
+        """
+        with self._lock:
+            self.requested += 1
+            if controls:
+                self._controls.extend(c for c in controls if c not in self._controls)
+            else:
+                self._full = True
+            if self._scheduled:
+                return
+            self._scheduled = True
+
+        page = self.page
+        if page is not None:
+            page.loop.call_soon_threadsafe(self._schedule)
+
+    def _schedule(self) -> None:
+        if self.delay > 0 and self.page is not None:
+            self.page.loop.call_later(self.delay, self.flush)
+        else:
+            self.flush()
+
+    def flush(self) -> None:
+        """Send the pending update now."""
+        with self._lock:
+            if not self._scheduled:
+                return
+            full, controls = self._full, self._controls
+            self._scheduled, self._full, self._controls = False, False, []
+            self.flushed += 1
+
+        page = self.page
+        if page is None:
+            return
+        try:
+            if full:
+                page.update()
+            else:
+                page.update(*controls)
+        except Exception as e:
+            print(f"Error updating page: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many updates were requested versus actually sent."""
+        return {
+            "requested": self.requested,
+            "flushed": self.flushed,
+            "coalesced": self.requested - self.flushed,
+        }
@@ -0,0 +1,88 @@
+# watchlist_store.py
+"""Debounced, atomic write-behind persistence for the watchlist.
+
+Edits only record the latest list; a single writer task waits ``delay``
+seconds for further edits, then writes the newest snapshot in a worker
+thread. Each write goes to a temporary file that is fsynced and renamed
+over the target, so a crash leaves either the old or the new file, never
+a truncated one. Any number of edits inside the window costs one write.
+"""
+
+import asyncio
+import json
+import os
+from typing import List, Optional
+
+
+class WatchlistStore:
+    """Load and save the watchlist file without blocking the event loop."""
+
+    def __init__(self, path: str, delay: float = 0.5):
+        self.path = path
+        self.delay = delay
+        self._pending: Optional[List[str]] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+        self.saves_requested = 0
+        self.writes = 0
+
+    def load(self) -> List[str]:
+        """
+        Read the saved watchlist.
+
+        Returns:
+            Saved cities, or an empty list if the file is missing or invalid
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                cities = json.load(f)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Error loading watchlist: {e}")
+            return []
+        return [city for city in cities if isinstance(city, str)]
+
+    async def save(self, cities: List[str]) -> None:
+        """
+        Schedule a write of ``cities``; later calls replace earlier ones.
+
+        Args:
+            cities: Full watchlist to persist
+        """
+        self._pending = list(cities)
+        self.saves_requested += 1
+        if self._writer is None or self._writer.done():
+            self._wake.clear()
+            self._writer = asyncio.create_task(self._write_behind())
+
+    async def flush(self) -> None:
+        """Write any pending snapshot now and wait for it to finish."""
+        if self._writer is not None and not self._writer.done():
+            self._wake.set()
+            await self._writer
+
+    async def _write_behind(self) -> None:
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=self.delay)
+        except asyncio.TimeoutError:
+            pass
+
+        while self._pending is not None:
+            cities, self._pending = self._pending, None
+            try:
+                await asyncio.to_thread(self._write, cities)
+                self.writes += 1
+            except Exception as e:
+                print(f"Error saving watchlist: {e}")
+
+    def _write(self, cities: List[str]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cities, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
@@ -1,9 +1,19 @@
 # weather_service.py
 """Weather API service layer."""
 
+import asyncio
+import time
 import httpx
-from typing import Dict, Optional
+from array import array
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple, Union
+from mod6_labs.cache import TTLCache
+from mod6_labs.city_index import CityIndex
 from mod6_labs.config import Config
+from mod6_labs.disk_cache import DiskCache
+from mod6_labs.instrumentation import Instrumentation
+from mod6_labs.rate_limiter import Priority, RateLimiter
+from mod6_labs.resilience import RETRYABLE_STATUS, LatencyWindow, backoff_delay
 
 
 class WeatherServiceError(Exception):
@@ -11,65 +21,1084 @@ class WeatherServiceError(Exception):
     pass
 
 
+class RateLimitError(WeatherServiceError):
+    """Raised when the API answers 429 Too Many Requests."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _check_rate_limit(response: httpx.Response) -> None:
+    """Raise RateLimitError for a 429 response, honouring Retry-After."""
+    if response.status_code != 429:
+        return
+    try:
+        retry_after = float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        retry_after = None
+    raise RateLimitError(
+        "Too many requests to the weather service. Please try again shortly.",
+        retry_after=retry_after,
+    )
+
+
+def _http2_available() -> bool:
+    """Check whether the optional 'h2' package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def normalize_city(city: str) -> str:
+    """Fold case and collapse whitespace so equivalent city names share a key."""
+    return " ".join(city.split()).casefold()
+
+
+class WeatherSnapshot:
+    """Current conditions for one city, holding only the fields the UI uses.
+
+    Built once from a /weather response and reused for rendering, caching
+    and comparison instead of walking the raw JSON each time.
+    """
+
+    __slots__ = (
+        "city_id", "name", "country", "temp", "feels_like", "humidity",
+        "description", "icon", "wind_speed", "dt",
+    )
+
+    def __init__(
+        self,
+        city_id: Optional[int],
+        name: str,
+        country: str,
+        temp: float,
+        feels_like: float,
+        humidity: int,
+        description: str,
+        icon: str,
+        wind_speed: float,
+        dt: int = 0,
+    ):
+        self.city_id = city_id
+        self.name = name
+        self.country = country
+        self.temp = temp
+        self.feels_like = feels_like
+        self.humidity = humidity
+        self.description = description
+        self.icon = icon
+        self.wind_speed = wind_speed
+        self.dt = dt
+
+    @classmethod
+    def from_response(cls, data: Dict) -> "WeatherSnapshot":
+        """Parse a /weather (or /group list item) response."""
+        main = data.get("main", {})
+        weather = (data.get("weather") or [{}])[0]
+        return cls(
+            city_id=data.get("id"),
+            name=data.get("name", "Unknown"),
+            country=data.get("sys", {}).get("country", ""),
+            temp=main.get("temp", 0),
+            feels_like=main.get("feels_like", 0),
+            humidity=main.get("humidity", 0),
+            description=weather.get("description", "").title(),
+            icon=weather.get("icon", "01d"),
+            wind_speed=data.get("wind", {}).get("speed", 0),
+            dt=data.get("dt", 0),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "WeatherSnapshot":
+        """Rebuild a snapshot from ``to_dict()`` output."""
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the snapshot as a flat, JSON-serializable dict."""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, WeatherSnapshot):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"WeatherSnapshot({self.name}, {self.country}, {self.temp})"
+
+
+class Forecast:
+    """5-day / 3-hour forecast stored as compact typed columns.
+
+    Each slot contributes one entry to the ``dt``, ``temp``, ``feels_like``,
+    ``humidity``, ``wind_speed``, ``condition`` and ``icons`` columns;
+    condition descriptions are stored once per condition ID.
+    """
+
+    __slots__ = (
+        "city_id", "name", "country", "timezone", "dt", "temp", "feels_like",
+        "humidity", "wind_speed", "condition", "icons", "descriptions",
+    )
+
+    SLOT_SECONDS = 3 * 60 * 60
+
+    def __init__(
+        self,
+        city_id: Optional[int],
+        name: str,
+        country: str,
+        timezone: int,
+        dt: array,
+        temp: array,
+        humidity: array,
+        condition: array,
+        icons: List[str],
+        descriptions: Dict[int, str],
+        feels_like: Optional[array] = None,
+        wind_speed: Optional[array] = None,
+    ):
+        self.city_id = city_id
+        self.name = name
+        self.country = country
+        self.timezone = timezone
+        self.dt = dt
+        self.temp = temp
+        self.feels_like = feels_like if feels_like is not None else array("d", temp)
+        self.humidity = humidity
+        self.wind_speed = wind_speed if wind_speed is not None else array("d", bytes(8 * len(dt)))
+        self.condition = condition
+        self.icons = icons
+        self.descriptions = descriptions
+
+    def __len__(self) -> int:
+        return len(self.dt)
+
+    @classmethod
+    def from_response(cls, data: Dict) -> "Forecast":
+        """Parse a /forecast response."""
+        dt, temp, humidity, condition = array("q"), array("d"), array("q"), array("q")
+        feels_like, wind_speed = array("d"), array("d")
+        icons: List[str] = []
+        descriptions: Dict[int, str] = {}
+
+        for item in data.get("list", []):
+            main = item.get("main", {})
+            weather = (item.get("weather") or [{}])[0]
+            condition_id = weather.get("id", 0)
+
+            dt.append(int(item.get("dt", 0)))
+            temp.append(main.get("temp", 0))
+            feels_like.append(main.get("feels_like", main.get("temp", 0)))
+            humidity.append(int(main.get("humidity", 0)))
+            wind_speed.append(item.get("wind", {}).get("speed", 0))
+            condition.append(int(condition_id))
+            icons.append(weather.get("icon", "01d"))
+            descriptions.setdefault(condition_id, weather.get("description", "").title())
+
+        city = data.get("city", {})
+        return cls(
+            city_id=city.get("id"),
+            name=city.get("name", "Unknown"),
+            country=city.get("country", ""),
+            timezone=city.get("timezone", 0),
+            dt=dt,
+            temp=temp,
+            humidity=humidity,
+            condition=condition,
+            icons=icons,
+            descriptions=descriptions,
+            feels_like=feels_like,
+            wind_speed=wind_speed,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Forecast":
+        """Rebuild a forecast from ``to_dict()`` output."""
+        return cls(
+            city_id=data["city_id"],
+            name=data["name"],
+            country=data["country"],
+            timezone=data["timezone"],
+            dt=array("q", data["dt"]),
+            temp=array("d", data["temp"]),
+            humidity=array("q", data["humidity"]),
+            condition=array("q", data["condition"]),
+            icons=list(data["icons"]),
+            descriptions={int(k): v for k, v in data["descriptions"].items()},
+            feels_like=array("d", data["feels_like"]) if "feels_like" in data else None,
+            wind_speed=array("d", data["wind_speed"]) if "wind_speed" in data else None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the forecast as a JSON-serializable dict of lists."""
+        return {
+            "city_id": self.city_id,
+            "name": self.name,
+            "country": self.country,
+            "timezone": self.timezone,
+            "dt": self.dt.tolist(),
+            "temp": self.temp.tolist(),
+            "feels_like": self.feels_like.tolist(),
+            "humidity": self.humidity.tolist(),
+            "wind_speed": self.wind_speed.tolist(),
+            "condition": self.condition.tolist(),
+            "icons": list(self.icons),
+            "descriptions": dict(self.descriptions),
+        }
+
+    def current_at(self, timestamp: float) -> Optional[WeatherSnapshot]:
+        """
+        Derive current conditions from the slot covering ``timestamp``.
+
+        Args:
+            timestamp: UTC epoch seconds
+
+        Returns:
+            WeatherSnapshot built from that slot, or None if no slot is
+            within one slot length of ``timestamp``
+        """
+        best = None
+        for i, slot_dt in enumerate(self.dt):
+            if abs(slot_dt - timestamp) < self.SLOT_SECONDS and (
+                best is None or abs(slot_dt - timestamp) < abs(self.dt[best] - timestamp)
+            ):
+                best = i
+        if best is None:
+            return None
+
+        return WeatherSnapshot(
+            city_id=self.city_id,
+            name=self.name,
+            country=self.country,
+            temp=self.temp[best],
+            feels_like=self.feels_like[best],
+            humidity=self.humidity[best],
+            description=self.descriptions.get(self.condition[best], ""),
+            icon=self.icons[best],
+            wind_speed=self.wind_speed[best],
+            dt=self.dt[best],
+        )
+
+    def __repr__(self) -> str:
+        return f"Forecast({self.name}, {self.country}, {len(self)} slots)"
+
+
+# Record type parsed from each endpoint's responses (keyed like cache_key)
+RECORD_TYPES = {"weather": WeatherSnapshot, "forecast": Forecast}
+Record = Union[WeatherSnapshot, Forecast]
+
+
+class CityBundle(NamedTuple):
+    """Current conditions and forecast for one city; each part may be an error."""
+    current: Union[WeatherSnapshot, "WeatherServiceError"]
+    forecast: Union[Forecast, "WeatherServiceError"]
+
+
 class WeatherService:
-    """Service for fetching weather data from OpenWeatherMap API."""
-    
-    def __init__(self):
+    """Service for fetching weather data from OpenWeatherMap API.
+
+    The service owns a single long-lived ``httpx.AsyncClient`` so that
+    connections (DNS, TCP and TLS setup) are reused across lookups. Use it
+    as an async context manager, or call ``aclose()`` when the app session
+    ends.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None,
+        cache: Optional[TTLCache] = None,
+        disk_cache: Optional[DiskCache] = None,
+        city_index: Optional[CityIndex] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        hedge: Optional[bool] = None,
+        deadline: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        # Configuration is validated on first use, not at import time
+        Config.validate()
+
         self.api_key = Config.API_KEY
         self.base_url = Config.BASE_URL
+        self.forecast_url = Config.FORECAST_URL
+        self.group_url = Config.GROUP_URL
         self.timeout = Config.TIMEOUT
-    
-    async def get_weather(self, city: str) -> Dict:
+
+        # Connection pool settings (fall back to Config defaults)
+        self.limits = httpx.Limits(
+            max_connections=(
+                max_connections if max_connections is not None
+                else Config.MAX_CONNECTIONS
+            ),
+            max_keepalive_connections=(
+                max_keepalive_connections if max_keepalive_connections is not None
+                else Config.MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=(
+                keepalive_expiry if keepalive_expiry is not None
+                else Config.KEEPALIVE_EXPIRY
+            ),
+        )
+        wants_http2 = Config.HTTP2 if http2 is None else http2
+        self.http2 = wants_http2 and _http2_available()
+
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Response cache shared by current weather and forecast lookups
+        self.cache = cache if cache is not None else TTLCache(
+            max_size=Config.CACHE_MAX_SIZE,
+            default_ttl=Config.CURRENT_WEATHER_TTL,
+        )
+
+        # Optional persistent store (stale-while-revalidate), committed per tick
+        self.disk_cache = disk_cache
+        self._disk_flush_pending = False
+
+        # Requests currently in flight, shared by concurrent callers
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced_requests = 0
+        self.derived_current = 0  # current conditions served from a forecast slot
+
+        # Normalized city name -> OpenWeather city ID (for group requests),
+        # least recently used dropped first so long batch runs stay bounded
+        self.city_ids: "OrderedDict[str, int]" = OrderedDict()
+        self.max_city_ids = Config.CITY_ID_CACHE_SIZE
+        self.city_index = city_index
+
+        # Client-side quota; interactive lookups jump ahead of background work
+        self.rate_limiter = rate_limiter if rate_limiter is not None else (
+            RateLimiter.per_period(
+                Config.RATE_LIMIT_CALLS, Config.RATE_LIMIT_PERIOD, Config.RATE_LIMIT_BURST
+            )
+        )
+
+        # Tail latency: optional hedging plus a per-operation deadline
+        self.hedge = Config.HEDGE_REQUESTS if hedge is None else hedge
+        self.deadline = Config.DEADLINE if deadline is None else deadline
+        self.max_retries = Config.MAX_RETRIES if max_retries is None else max_retries
+        self.latency = LatencyWindow(
+            quantile=Config.HEDGE_QUANTILE,
+            min_delay=Config.HEDGE_MIN_DELAY,
+            default_delay=Config.HEDGE_DEFAULT_DELAY,
+        )
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.retries = 0
+        self.deadlines_exceeded = 0
+
+        # Per-phase HTTP timings and parse spans (no-op unless enabled)
+        self.instrumentation = instrumentation if instrumentation is not None else (
+            Instrumentation(enabled=Config.INSTRUMENT)
+        )
+
+    async def __aenter__(self) -> "WeatherService":
+        self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the shared HTTP client is currently open."""
+        return self._client is not None and not self._client.is_closed
+
+    def open(self) -> httpx.AsyncClient:
+        """
+        Open the shared HTTP client if it is not already open.
+
+        Returns:
+            The pooled AsyncClient used for all requests
+        """
+        if not self.is_open:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                event_hooks=self.instrumentation.event_hooks(),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and release pooled connections."""
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+
+        if self.disk_cache is not None:
+            self._flush_disk_cache()
+
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    @staticmethod
+    def cache_key(endpoint: str, *parts) -> Hashable:
+        """
+        Build a normalized cache key for an endpoint lookup.
+
+        Args:
+            endpoint: Endpoint name ("weather" or "forecast")
+            *parts: City name, or latitude and longitude
+
+        Returns:
+            Hashable key; units are not part of it since data is always
+            fetched in the canonical Config.UNITS and converted for display
+        """
+        normalized = tuple(
+            normalize_city(part) if isinstance(part, str) else round(part, 4)
+            for part in parts
+        )
+        return (endpoint, *normalized)
+
+    def rate_limit_stats(self) -> Dict:
+        """Return rate limiter queue depth and wait-time metrics."""
+        return self.rate_limiter.stats()
+
+    def latency_stats(self) -> Dict:
+        """Return hedging, retry and deadline counters."""
+        return {
+            "hedging": self.hedge,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "retries": self.retries,
+            "deadlines_exceeded": self.deadlines_exceeded,
+        }
+
+    def cache_stats(self) -> Dict:
+        """Return cache hit/miss and request coalescing statistics."""
+        stats = self.cache.stats()
+        stats["coalesced"] = self.coalesced_requests
+        stats["derived_current"] = self.derived_current
+        if self.disk_cache is not None:
+            stats["disk"] = self.disk_cache.stats()
+        return stats
+
+    def is_fresh(self, endpoint: str, *parts) -> bool:
+        """Whether a lookup would be answered from the memory cache."""
+        return self.cache_key(endpoint, *parts) in self.cache
+
+    async def get_weather(
+        self,
+        city: str,
+        priority: int = Priority.INTERACTIVE,
+        refresh: bool = False,
+    ) -> WeatherSnapshot:
         """
         Fetch weather data for a given city.
-        
+
         Args:
             city: Name of the city
-            
+            priority: Rate limiter lane for a network request
+            refresh: Request new data even if the cached entry is fresh
+
         Returns:
-            Dictionary containing weather data
-            
+            WeatherSnapshot with the current conditions; while the API is
+            throttling, derived from a fresh cached (or in-flight) forecast
+            if there is one
+
         Raises:
             WeatherServiceError: If the request fails
         """
         if not city:
             raise WeatherServiceError("City name cannot be empty")
-        
+
+        key = self.cache_key("weather", city)
+        fetch = lambda: self._request_weather(city, priority)
+        try:
+            if refresh:
+                return await self._single_flight(key, Config.CURRENT_WEATHER_TTL, fetch, priority)
+            return await self._cached(key, Config.CURRENT_WEATHER_TTL, fetch, priority)
+        except RateLimitError:
+            # A forecast already on its way can still stand in
+            forecast = self._inflight.get(self.cache_key("forecast", city))
+            if forecast is not None:
+                self.rate_limiter.promote(forecast, priority)
+                await asyncio.wait({forecast})
+            hit = self._lookup(self.cache_key("forecast", city))
+            derived = self._derive_current(hit[0]) if hit and hit[1] else None
+            if derived is None:
+                raise
+            return derived
+
+    async def get_city_bundle(
+        self,
+        city: str,
+        priority: int = Priority.INTERACTIVE,
+    ) -> CityBundle:
+        """
+        Fetch current weather and the forecast for a city concurrently.
+
+        Both parts go through the usual caches, so switching between the
+        current and forecast views afterwards needs no request. If the
+        current endpoint is throttled, current conditions are derived from
+        the forecast slot closest to now.
+
+        Args:
+            city: Name of the city
+            priority: Rate limiter lane for network requests
+
+        Returns:
+            CityBundle whose parts are records, or the WeatherServiceError
+            raised while fetching them
+
+        Raises:
+            WeatherServiceError: If neither part could be fetched
+        """
+        if not city:
+            raise WeatherServiceError("City name cannot be empty")
+
+        current, forecast = await asyncio.gather(
+            self.get_weather(city, priority),
+            self.get_forecast(city, priority),
+            return_exceptions=True,
+        )
+        for result in (current, forecast):
+            if isinstance(result, BaseException) and not isinstance(result, WeatherServiceError):
+                raise result
+
+        if isinstance(current, RateLimitError) and isinstance(forecast, Forecast):
+            current = self._derive_current(forecast) or current
+        if isinstance(current, WeatherServiceError) and isinstance(forecast, WeatherServiceError):
+            raise current
+        return CityBundle(current, forecast)
+
+    def _derive_current(self, forecast: Forecast) -> Optional[WeatherSnapshot]:
+        """Build current conditions from the forecast slot covering now."""
+        snapshot = forecast.current_at(time.time())
+        if snapshot is not None:
+            self.derived_current += 1
+        return snapshot
+
+    async def get_weather_by_coordinates(
+        self,
+        lat: float,
+        lon: float,
+        priority: int = Priority.INTERACTIVE,
+    ) -> WeatherSnapshot:
+        """
+        Fetch weather data by coordinates.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            priority: Rate limiter lane for a network request
+
+        Returns:
+            WeatherSnapshot with the current conditions
+        """
+        return await self._cached(
+            self.cache_key("weather", lat, lon),
+            Config.CURRENT_WEATHER_TTL,
+            lambda: self._request_coordinates(lat, lon, priority),
+            priority,
+        )
+
+    async def get_forecast(
+        self,
+        city: str,
+        priority: int = Priority.INTERACTIVE,
+    ) -> Forecast:
+        """
+        Get 5-day weather forecast.
+
+        Args:
+            city: Name of the city
+            priority: Rate limiter lane for a network request
+
+        Returns:
+            Forecast with the 3-hourly slots
+
+        Raises:
+            WeatherServiceError: If the request fails
+        """
+        if not city:
+            raise WeatherServiceError("City name cannot be empty")
+
+        return await self._cached(
+            self.cache_key("forecast", city),
+            Config.FORECAST_TTL,
+            lambda: self._request_forecast(city, priority),
+            priority,
+        )
+
+    async def get_weather_many(
+        self,
+        cities: List[str],
+        concurrency: Optional[int] = None,
+        priority: int = Priority.BACKGROUND,
+        refresh_ahead: float = 0.0,
+    ) -> List[Union[WeatherSnapshot, WeatherServiceError]]:
+        """
+        Fetch weather for many cities using the multi-city group endpoint.
+
+        Cities with a known ID are requested in chunks of up to
+        Config.GROUP_MAX_IDS per call. Names that cannot be resolved to an
+        ID, or that a group call fails to return, fall back to individual
+        ``get_weather`` calls (which also teach the service their IDs).
+        A rate-limited group call is not retried per city; its cities get
+        the RateLimitError instead.
+
+        With ``refresh_ahead``, cached entries that expire within that many
+        seconds are requested again, so a periodic refresh can keep them
+        fresh until its next run. If such a refresh fails, the error is
+        returned and the cached entry is kept until it expires.
+
+        Args:
+            cities: City names
+            concurrency: Maximum parallel requests (defaults to
+                Config.WATCHLIST_CONCURRENCY)
+            priority: Rate limiter lane (background unless user-facing)
+            refresh_ahead: Refresh cached entries expiring within this many seconds
+
+        Returns:
+            WeatherSnapshot or error for each city, in the same order as ``cities``
+        """
+        limit = concurrency if concurrency is not None else Config.WATCHLIST_CONCURRENCY
+        results: List[Union[WeatherSnapshot, WeatherServiceError, None]] = [None] * len(cities)
+        indices_by_id: Dict[int, List[int]] = {}
+        fallback: List[int] = []
+        refreshing = set()  # indices of fresh entries refreshed ahead of expiry
+
+        for index, city in enumerate(cities):
+            if not city:
+                results[index] = WeatherServiceError("City name cannot be empty")
+                continue
+
+            key = self.cache_key("weather", city)
+            hit = self._lookup(key)
+            if hit is not None and hit[1]:
+                remaining = self.cache.ttl_remaining(key)
+                if remaining is None or remaining >= refresh_ahead:
+                    results[index] = hit[0]
+                    continue
+                refreshing.add(index)
+
+            city_id = self.resolve_city_id(city)
+            if city_id is None:
+                fallback.append(index)
+            else:
+                indices_by_id.setdefault(city_id, []).append(index)
+
+        ids = list(indices_by_id)
+        chunks = [
+            ids[start:start + Config.GROUP_MAX_IDS]
+            for start in range(0, len(ids), Config.GROUP_MAX_IDS)
+        ]
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def fetch_chunk(chunk: List[int]) -> None:
+            rate_limited = None
+            async with semaphore:
+                try:
+                    by_id = await self._request_group(chunk, priority)
+                except RateLimitError as e:
+                    by_id, rate_limited = {}, e
+                except WeatherServiceError:
+                    by_id = {}
+
+            for city_id in chunk:
+                data = by_id.get(city_id)
+                for index in indices_by_id[city_id]:
+                    if rate_limited is not None:
+                        # Falling back to per-city calls would only dig deeper
+                        results[index] = rate_limited
+                    elif data is None:
+                        fallback.append(index)
+                    else:
+                        key = self.cache_key("weather", cities[index])
+                        self._store(key, data, Config.CURRENT_WEATHER_TTL)
+                        results[index] = data
+
+        await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+
+        async def fetch_one(index: int) -> None:
+            async with semaphore:
+                try:
+                    results[index] = await self.get_weather(
+                        cities[index], priority=priority, refresh=index in refreshing
+                    )
+                except WeatherServiceError as e:
+                    results[index] = e
+
+        await asyncio.gather(*(fetch_one(index) for index in fallback))
+        return results
+
+    async def _cached(
+        self,
+        key: Hashable,
+        ttl: float,
+        fetch: Callable[[], Awaitable[Record]],
+        priority: int = Priority.INTERACTIVE,
+    ) -> Record:
+        """
+        Serve a lookup from the memory cache, then the disk cache, then
+        the network.
+
+        Stale disk entries are returned immediately and refreshed in the
+        background (stale-while-revalidate).
+
+        Args:
+            key: Normalized cache key
+            ttl: Freshness lifetime in seconds
+            fetch: Coroutine factory performing the network request
+            priority: Rate limiter lane of this caller
+
+        Returns:
+            Parsed record
+        """
+        hit = self._lookup(key)
+        if hit is not None:
+            data, is_fresh = hit
+            if not is_fresh:
+                self._revalidate(key, ttl, fetch)
+            return data
+
+        return await self._single_flight(key, ttl, fetch, priority)
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[Record, bool]]:
+        """
+        Look a key up in the memory cache, then the disk cache.
+
+        Fresh disk entries are promoted to the memory cache. Disk entries
+        that no longer parse (e.g. written by an older version) count as
+        misses.
+
+        Returns:
+            Tuple of (record, is_fresh), or None on a miss
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, True
+
+        if self.disk_cache is not None:
+            hit = self.disk_cache.get(key)
+            if hit is not None:
+                data, is_fresh, expires_at = hit
+                try:
+                    record = RECORD_TYPES[key[0]].from_dict(data)
+                except (KeyError, TypeError, ValueError):
+                    return None
+                self._remember_city_id(key, record)
+                if is_fresh:
+                    self.cache.set(key, record, ttl=expires_at - time.time())
+                return record, is_fresh
+
+        return None
+
+    def _flight(
+        self,
+        key: Hashable,
+        ttl: float,
+        fetch: Callable[[], Awaitable[Record]],
+    ) -> "asyncio.Task":
+        """
+        Return the in-flight request task for a key, starting one if needed.
+
+        The task fetches and stores the response; it is dropped from the
+        in-flight table as soon as it finishes.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+
+        async def fetch_and_store() -> Record:
+            data = await fetch()
+            self._store(key, data, ttl)
+            return data
+
+        def finished(done: "asyncio.Task") -> None:
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+            if not done.cancelled():
+                done.exception()  # Mark retrieved even if every caller left
+
+        task = asyncio.ensure_future(fetch_and_store())
+        task.add_done_callback(finished)
+        self._inflight[key] = task
+        return task
+
+    async def _single_flight(
+        self,
+        key: Hashable,
+        ttl: float,
+        fetch: Callable[[], Awaitable[Record]],
+        priority: int = Priority.INTERACTIVE,
+    ) -> Record:
+        """
+        Await the shared request for a key so concurrent callers make
+        one HTTP call between them.
+
+        The request runs in the lane of whoever started it; a caller with
+        a higher priority that joins promotes it (including a token it is
+        already queued for). A caller that is cancelled does not cancel the
+        request for the others still waiting on it.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced_requests += 1
+            self.rate_limiter.promote(task, priority)
+        return await asyncio.shield(self._flight(key, ttl, fetch))
+
+    def _store(self, key: Hashable, record: Record, ttl: float) -> None:
+        """Write a fresh record to the memory and disk caches."""
+        self._remember_city_id(key, record)
+        self.cache.set(key, record, ttl=ttl)
+        if self.disk_cache is not None:
+            self.disk_cache.set(key, record.to_dict(), ttl=ttl)
+            self._schedule_disk_flush()
+
+    def _schedule_disk_flush(self) -> None:
+        """Commit disk cache writes once per event-loop tick, not per entry."""
+        if self._disk_flush_pending:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.disk_cache.flush()
+            return
+        self._disk_flush_pending = True
+        loop.call_soon(self._flush_disk_cache)
+
+    def _flush_disk_cache(self) -> None:
+        self._disk_flush_pending = False
+        try:
+            self.disk_cache.flush()
+        except Exception as e:
+            print(f"Error writing disk cache: {e}")
+
+    def _remember_city_id(self, key: Hashable, record: Record) -> None:
+        """Record the OpenWeather city ID from a current-weather snapshot."""
+        endpoint, query = key[0], key[1]
+        if endpoint == "weather" and isinstance(query, str) and record.city_id is not None:
+            self.city_ids[query] = record.city_id
+            self.city_ids.move_to_end(query)
+            while len(self.city_ids) > self.max_city_ids:
+                self.city_ids.popitem(last=False)
+
+    def resolve_city_id(self, city: str) -> Optional[int]:
+        """
+        Resolve a city name to its OpenWeather city ID.
+
+        IDs are learned from earlier current-weather responses, or looked
+        up in the offline city index once it has been loaded.
+
+        Args:
+            city: Name of the city
+
+        Returns:
+            City ID, or None if the name has not been resolved yet
+        """
+        key = normalize_city(city)
+        city_id = self.city_ids.get(key)
+        if city_id is not None:
+            self.city_ids.move_to_end(key)
+        if city_id is None and self.city_index is not None and self.city_index.loaded:
+            record = self.city_index.resolve(city)
+            if record is not None:
+                city_id = record.id
+        return city_id
+
+    def _revalidate(
+        self,
+        key: Hashable,
+        ttl: float,
+        fetch: Callable[[], Awaitable[Record]],
+    ) -> None:
+        """Refresh a stale entry in the background (once per key).
+
+        Failures are swallowed by the in-flight task; the stale entry keeps
+        being served until a later refresh succeeds.
+        """
+        self._flight(key, ttl, fetch)
+
+    async def _send(
+        self,
+        endpoint: str,
+        url: str,
+        params: Dict,
+        priority: int,
+    ) -> httpx.Response:
+        """
+        Send a GET request within the per-operation deadline.
+
+        Each attempt waits for rate limiter quota first. Network errors and
+        502/503/504 responses are retried with jittered exponential
+        back-off while the deadline allows; other responses are returned
+        as-is for the caller to interpret.
+
+        For interactive requests the deadline also covers waiting for the
+        first token. Background work may queue for quota as long as it
+        takes (batch runs are paced by the limiter), so its deadline starts
+        once the first token is granted. Waits for retry tokens are always
+        bounded by the deadline, and no attempt (or token) is spent once
+        it has passed.
+
+        Args:
+            endpoint: Endpoint name used for latency tracking
+            url: Request URL
+            params: Query parameters
+            priority: Rate limiter lane
+
+        Returns:
+            The HTTP response
+
+        Raises:
+            httpx.TimeoutException: If the deadline runs out
+            httpx.TransportError: If the last attempt failed at the network level
+        """
+        deadline = time.monotonic() + self.deadline
+        if priority == Priority.INTERACTIVE:
+            await self._acquire_before(deadline, priority)
+        else:
+            await self.rate_limiter.acquire(priority)
+            deadline = time.monotonic() + self.deadline
+        attempt = 0
+
+        while True:
+            try:
+                response = await self._attempt(endpoint, url, params, deadline)
+                error = None
+            except httpx.TransportError as e:
+                response, error = None, e
+
+            if error is None and response.status_code not in RETRYABLE_STATUS:
+                return response
+
+            attempt += 1
+            delay = backoff_delay(attempt, Config.RETRY_BACKOFF, Config.RETRY_BACKOFF_MAX)
+            if attempt > self.max_retries or time.monotonic() + delay >= deadline:
+                if error is not None:
+                    raise error
+                return response
+
+            self.retries += 1
+            await asyncio.sleep(delay)
+            try:
+                await self._acquire_before(deadline, priority)
+            except httpx.TimeoutException:
+                if error is not None:
+                    raise error
+                return response
+
+    async def _acquire_before(self, deadline: float, priority: int) -> None:
+        """
+        Take a rate limiter token, giving up when ``deadline`` passes.
+
+        Raises:
+            httpx.TimeoutException: If the deadline passed before a token was granted
+        """
+        remaining = deadline - time.monotonic()
+        try:
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            await self.rate_limiter.acquire(priority, timeout=remaining)
+        except asyncio.TimeoutError:
+            self.deadlines_exceeded += 1
+            raise httpx.TimeoutException("Deadline exceeded waiting for rate limit quota")
+
+    async def _attempt(
+        self,
+        endpoint: str,
+        url: str,
+        params: Dict,
+        deadline: float,
+    ) -> httpx.Response:
+        """
+        Make one request attempt, hedging it if enabled.
+
+        When hedging, a duplicate request is sent if the first has not
+        answered within the endpoint's recent p95 latency (and a rate
+        limiter token is free); whichever succeeds first wins and the other
+        is cancelled.
+        """
+        client = self.open()
+        start = time.monotonic()
+        primary = asyncio.ensure_future(client.get(url, params=params))
+        pending = {primary}
+        error: Optional[BaseException] = None
+
+        try:
+            if self.hedge:
+                delay = self.latency.hedge_delay(endpoint)
+                if start + delay < deadline:
+                    done, _ = await asyncio.wait(pending, timeout=delay)
+                    if not done and self.rate_limiter.try_acquire():
+                        pending.add(asyncio.ensure_future(client.get(url, params=params)))
+                        self.hedges_sent += 1
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, deadline - time.monotonic()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    self.deadlines_exceeded += 1
+                    raise httpx.TimeoutException("Deadline exceeded")
+
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedges_won += 1
+                        self.latency.record(endpoint, time.monotonic() - start)
+                        return task.result()
+                    error = task.exception()
+
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _request_weather(
+        self,
+        city: str,
+        priority: int = Priority.INTERACTIVE,
+    ) -> WeatherSnapshot:
+        """Request current weather for a city from the API."""
         # Build request parameters
         params = {
             "q": city,
             "appid": self.api_key,
             "units": Config.UNITS,
         }
-        
+
         try:
-            # Make async HTTP request
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                
-                # Check for HTTP errors
-                if response.status_code == 404:
-                    raise WeatherServiceError(
-                        f"City '{city}' not found. Please check the spelling."
-                    )
-                elif response.status_code == 401:
-                    raise WeatherServiceError(
-                        "Invalid API key. Please check your configuration."
-                    )
-                elif response.status_code >= 500:
-                    raise WeatherServiceError(
-                        "Weather service is currently unavailable. "
-                        "Please try again later."
-                    )
-                elif response.status_code != 200:
-                    raise WeatherServiceError(
-                        f"Error fetching weather data: {response.status_code}"
-                    )
-                
-                # Parse JSON response
-                data = response.json()
-                return data
-                
+            # Make async HTTP request over the pooled client
+            response = await self._send("weather", self.base_url, params, priority)
+
+            # Check for HTTP errors
+            if response.status_code == 404:
+                raise WeatherServiceError(
+                    f"City '{city}' not found. Please check the spelling."
+                )
+            elif response.status_code == 401:
+                raise WeatherServiceError(
+                    "Invalid API key. Please check your configuration."
+                )
+            elif response.status_code == 429:
+                _check_rate_limit(response)
+            elif response.status_code >= 500:
+                raise WeatherServiceError(
+                    "Weather service is currently unavailable. "
+                    "Please try again later."
+                )
+            elif response.status_code != 200:
+                raise WeatherServiceError(
+                    f"Error fetching weather data: {response.status_code}"
+                )
+
+            # Parse JSON response into a compact record
+            with self.instrumentation.span("parse.weather"):
+                return WeatherSnapshot.from_response(response.json())
+
+        except WeatherServiceError:
+            raise
         except httpx.TimeoutException:
             raise WeatherServiceError(
                 "Request timed out. Please check your internet connection."
@@ -82,66 +1111,80 @@ class WeatherService:
             raise WeatherServiceError(f"HTTP error occurred: {str(e)}")
         except Exception as e:
             raise WeatherServiceError(f"An unexpected error occurred: {str(e)}")
-    
-    async def get_weather_by_coordinates(
-        self, 
-        lat: float, 
-        lon: float
-    ) -> Dict:
-        """
-        Fetch weather data by coordinates.
-        
-        Args:
-            lat: Latitude
-            lon: Longitude
-            
-        Returns:
-            Dictionary containing weather data
-        """
+
+    async def _request_coordinates(
+        self,
+        lat: float,
+        lon: float,
+        priority: int = Priority.INTERACTIVE,
+    ) -> WeatherSnapshot:
+        """Request current weather for coordinates from the API."""
         params = {
             "lat": lat,
             "lon": lon,
             "appid": self.api_key,
             "units": Config.UNITS,
         }
-        
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                return response.json()
-                
+            response = await self._send("weather", self.base_url, params, priority)
+            _check_rate_limit(response)
+            response.raise_for_status()
+            with self.instrumentation.span("parse.weather"):
+                return WeatherSnapshot.from_response(response.json())
+
+        except WeatherServiceError:
+            raise
         except Exception as e:
             raise WeatherServiceError(f"Error fetching weather data: {str(e)}")
-    
-    async def get_forecast(self, city: str) -> Dict:
-        """
-        Get 5-day weather forecast.
-        
-        Args:
-            city: Name of the city
-            
-        Returns:
-            Dictionary containing forecast data
-            
-        Raises:
-            WeatherServiceError: If the request fails
-        """
-        if not city:
-            raise WeatherServiceError("City name cannot be empty")
-        
-        forecast_url = "https://api.openweathermap.org/data/2.5/forecast"
+
+    async def _request_group(
+        self,
+        city_ids: List[int],
+        priority: int = Priority.BACKGROUND,
+    ) -> Dict[int, WeatherSnapshot]:
+        """Request current weather for up to GROUP_MAX_IDS city IDs at once."""
+        params = {
+            "id": ",".join(str(city_id) for city_id in city_ids),
+            "appid": self.api_key,
+            "units": Config.UNITS,
+        }
+
+        try:
+            response = await self._send("group", self.group_url, params, priority)
+            _check_rate_limit(response)
+            response.raise_for_status()
+            with self.instrumentation.span("parse.group"):
+                return {
+                    item["id"]: WeatherSnapshot.from_response(item)
+                    for item in response.json().get("list", [])
+                }
+
+        except WeatherServiceError:
+            raise
+        except Exception as e:
+            raise WeatherServiceError(f"Error fetching group weather data: {str(e)}")
+
+    async def _request_forecast(
+        self,
+        city: str,
+        priority: int = Priority.INTERACTIVE,
+    ) -> Forecast:
+        """Request the 5-day forecast for a city from the API."""
         params = {
             "q": city,
             "appid": self.api_key,
             "units": Config.UNITS,
         }
-        
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(forecast_url, params=params)
-                response.raise_for_status()
-                return response.json()
-                
+            response = await self._send("forecast", self.forecast_url, params, priority)
+            _check_rate_limit(response)
+            response.raise_for_status()
+            with self.instrumentation.span("parse.forecast"):
+                return Forecast.from_response(response.json())
+
+        except WeatherServiceError:
+            raise
         except Exception as e:
-            raise WeatherServiceError(f"Error fetching forecast data: {str(e)}")
\ No newline at end of file
+            raise WeatherServiceError(f"Error fetching forecast data: {str(e)}")
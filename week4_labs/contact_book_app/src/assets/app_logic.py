@@ -1,6 +1,7 @@
 # app_logic.py
 import flet as ft 
 from database import update_contact_db, delete_contact_db, add_contact_db, get_all_contacts_db 
+from update_batcher import UpdateBatcher 
 
 def display_contacts(page, contacts_list_view, db_conn, search_term=None): 
     """
@@ -151,7 +152,7 @@ def display_contacts(page, contacts_list_view, db_conn, search_term=None):
                 )
             )
     
-    page.update() 
+    UpdateBatcher.for_page(page).request() 
  
 def add_contact(page, inputs, contacts_list_view, db_conn, search_input=None): 
     """
@@ -163,7 +164,7 @@ def add_contact(page, inputs, contacts_list_view, db_conn, search_input=None):
     # Validation: Check if name is empty
     if not name_input.value or not name_input.value.strip():
         name_input.error_text = "Name cannot be empty"
-        page.update()
+        UpdateBatcher.for_page(page).request()
         return
     
     # Clear any previous error
@@ -172,7 +173,7 @@ def add_contact(page, inputs, contacts_list_view, db_conn, search_input=None):
     # Validation: Check if email is provided and contains @
     if email_input.value and email_input.value.strip() and "@" not in email_input.value:
         email_input.error_text = "Email must contain @"
-        page.update()
+        UpdateBatcher.for_page(page).request()
         return
     
     # Clear any previous error
@@ -190,7 +191,7 @@ def add_contact(page, inputs, contacts_list_view, db_conn, search_input=None):
         search_input.value = ""
  
     display_contacts(page, contacts_list_view, db_conn) 
-    page.update() 
+    UpdateBatcher.for_page(page).request() 
 
 def show_delete_confirmation(page, contact_id, contact_name, db_conn, contacts_list_view):
     """
@@ -199,12 +200,12 @@ def show_delete_confirmation(page, contact_id, contact_name, db_conn, contacts_l
     def confirm_delete(e):
         delete_contact_db(db_conn, contact_id)
         dialog.open = False
-        page.update()
+        UpdateBatcher.for_page(page).request()
         display_contacts(page, contacts_list_view, db_conn)
     
     def cancel_delete(e):
         dialog.open = False
-        page.update()
+        UpdateBatcher.for_page(page).request()
     
     dialog = ft.AlertDialog(
         modal=True,
@@ -275,14 +276,14 @@ def open_edit_dialog(page, contact, db_conn, contacts_list_view):
         focused_border_color="#2E7BD4",
         cursor_color="#4A90E2",
         keyboard_type=ft.KeyboardType.EMAIL,
-        on_change=lambda e: setattr(edit_email, 'value', edit_email.value.replace(' ', '')) or page.update()
+        on_change=lambda e: setattr(edit_email, 'value', edit_email.value.replace(' ', '')) or UpdateBatcher.for_page(page).request()
     ) 
  
     def save_and_close(e):
         # Validate name is not empty
         if not edit_name.value or not edit_name.value.strip():
             edit_name.error_text = "Name cannot be empty"
-            page.update()
+            UpdateBatcher.for_page(page).request()
             return
         
         edit_name.error_text = None
@@ -290,13 +291,13 @@ def open_edit_dialog(page, contact, db_conn, contacts_list_view):
         # Validate email contains @
         if edit_email.value and edit_email.value.strip() and "@" not in edit_email.value:
             edit_email.error_text = "Email must contain @"
-            page.update()
+            UpdateBatcher.for_page(page).request()
             return
         
         edit_email.error_text = None
         update_contact_db(db_conn, contact_id, edit_name.value.strip(), edit_phone.value, edit_email.value) 
         dialog.open = False 
-        page.update() 
+        UpdateBatcher.for_page(page).request() 
         display_contacts(page, contacts_list_view, db_conn) 
  
     dialog = ft.AlertDialog( 
@@ -316,7 +317,7 @@ def open_edit_dialog(page, contact, db_conn, contacts_list_view):
         actions=[ 
             ft.TextButton(
                 "Cancel", 
-                on_click=lambda e: setattr(dialog, 'open', False) or page.update(),
+                on_click=lambda e: setattr(dialog, 'open', False) or UpdateBatcher.for_page(page).request(),
                 style=ft.ButtonStyle(color="#7A8A99")
             ), 
             ft.ElevatedButton(
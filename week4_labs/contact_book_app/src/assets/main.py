@@ -2,6 +2,7 @@
 import flet as ft 
 from database import init_db 
 from app_logic import display_contacts, add_contact 
+from update_batcher import UpdateBatcher 
  
 def main(page: ft.Page): 
     page.title = "Contact Book" 
@@ -39,7 +40,7 @@ def main(page: ft.Page):
             theme_icon.icon = ft.Icons.DARK_MODE
             theme_icon.tooltip = "Switch to Dark Mode"
             theme_icon.icon_color = "#FFFFFF"
-        page.update()
+        UpdateBatcher.for_page(page).request()
     
     theme_icon = ft.IconButton(
         icon=ft.Icons.DARK_MODE,
@@ -91,7 +92,7 @@ def main(page: ft.Page):
         cursor_color="#4A90E2",
         color="#000000",
         keyboard_type=ft.KeyboardType.EMAIL,
-        on_change=lambda e: setattr(email_input, 'value', email_input.value.replace(' ', '')) or page.update()
+        on_change=lambda e: setattr(email_input, 'value', email_input.value.replace(' ', '')) or UpdateBatcher.for_page(page).request()
     ) 
  
     inputs = (name_input, phone_input, email_input)